@@ -10,11 +10,16 @@ setup(
         "websockets>=12.0",
         "loguru>=0.7.0",
     ],
+    extras_require={
+        "uvloop": ["uvloop>=0.19.0; sys_platform != 'win32'"],
+        "blake3": ["blake3>=0.3.0"],
+        "orjson": ["orjson>=3.9.0"],
+    },
     entry_points={
         "console_scripts": [
             "audio-stream-client=audio_client.audio_client_application:main",
-            "audio-stream-server=audio_server.audio_server_application:main",
+            "audio-stream-server=audio_server.audio_server_application:run",
         ],
     },
-    python_requires=">=3.8",
+    python_requires=">=3.11",
 )
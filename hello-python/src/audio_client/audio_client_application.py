@@ -17,6 +17,7 @@ from .core.download_manager import DownloadManager
 from .util.verification_module import verify
 from .util.performance_monitor import PerformanceMonitor
 from .core import file_manager
+from .event_loop import install_event_loop
 
 
 async def async_main():
@@ -46,7 +47,7 @@ async def async_main():
         
         # Connect to WebSocket server
         logger.phase("Connecting to Server")
-        ws = WebSocketClient(args.server)
+        ws = WebSocketClient(args.server, socket_buffer_size=args.socket_buffer)
         await ws.connect()
         logger.info("Successfully connected to server")
         
@@ -66,12 +67,9 @@ async def async_main():
                 logger.error("Upload failed")
                 sys.exit(1)
             logger.info(f"Upload completed successfully with stream ID: {stream_id}")
-            
-            # Sleep 2 seconds after upload
-            logger.info("Upload successful, sleeping for 2 seconds...")
-            await asyncio.sleep(2)
-            
-            # Download file
+
+            # STOPPED is only sent after the server has finalized the stream,
+            # so the download can start right away
             logger.phase("Starting Download")
             perf.start_download()
             # Create download manager with necessary components
@@ -87,13 +85,13 @@ async def async_main():
             perf.end_download()
             logger.info("Download completed successfully")
             
-            # Sleep 2 seconds after download
-            logger.info("Download successful, sleeping for 2 seconds...")
-            await asyncio.sleep(2)
-            
-            # Verify file integrity
+            # Verify file integrity; the transfer digests are SHA-256, so
+            # another --checksum algorithm hashes both files from disk
             logger.phase("Verifying File Integrity")
-            result = await verify(args.input, args.output)
+            result = await verify(args.input, args.output,
+                                  ("sha256", upload_manager.get_checksum()),
+                                  ("sha256", download_manager.get_checksum()),
+                                  algorithm=args.checksum)
             
             if result['passed']:
                 logger.info("✓ File verification PASSED - Files are identical")
@@ -137,6 +135,7 @@ async def async_main():
 
 def main():
     """Main entry point"""
+    install_event_loop()
     asyncio.run(async_main())
 
 
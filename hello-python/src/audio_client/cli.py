@@ -5,6 +5,8 @@ import os
 from datetime import datetime
 from pathlib import Path
 
+from .core.file_manager import blake3
+
 
 def parse_args():
     """Parse command-line arguments"""
@@ -27,6 +29,19 @@ def parse_args():
         "-o", "--output",
         help="Output file path (auto-generated if not specified)"
     )
+    parser.add_argument(
+        "-c", "--checksum",
+        choices=["sha256", "blake3"],
+        default="sha256",
+        help="Checksum algorithm for verification (default: sha256; blake3 needs the blake3 extra)"
+    )
+    parser.add_argument(
+        "-b", "--socket-buffer",
+        type=int,
+        default=0,
+        metavar="BYTES",
+        help="Fixed socket send/receive buffer size in bytes (default: 0, kernel autotuning)"
+    )
     parser.add_argument(
         "-v", "--verbose",
         action="store_true",
@@ -39,6 +54,12 @@ def parse_args():
     if not os.path.exists(args.input):
         parser.error(f"Input file not found: {args.input}")
     
+    if args.socket_buffer < 0:
+        parser.error("--socket-buffer must not be negative")
+    
+    if args.checksum == "blake3" and blake3 is None:
+        parser.error("--checksum blake3 requires the blake3 package")
+    
     # Generate output path if not provided
     if not args.output:
         timestamp = datetime.now().strftime("%Y-%m-%dT%H-%M-%S")
@@ -1,7 +1,8 @@
 """Chunk manager for handling file chunking operations"""
 
-CHUNK_SIZE = 65536  # 64KB
-UPLOAD_CHUNK_SIZE = 8192  # 8KB for WebSocket to avoid fragmentation
+from typing import List, Tuple
+
+CHUNK_SIZE = 1 << 20  # 1MB, sent as a single WebSocket frame
 
 
 class ChunkManager:
@@ -12,12 +13,14 @@ class ChunkManager:
         """Get default chunk size for file operations"""
         return CHUNK_SIZE
     
-    @staticmethod
-    def get_upload_chunk_size() -> int:
-        """Get chunk size for upload operations"""
-        return UPLOAD_CHUNK_SIZE
-    
     @staticmethod
     def calculate_chunks_needed(file_size: int, chunk_size: int) -> int:
         """Calculate number of chunks needed for a file"""
         return (file_size + chunk_size - 1) // chunk_size
+    
+    @staticmethod
+    def plan(file_size: int, chunk_size: int) -> List[Tuple[int, int]]:
+        """Calculate (offset, length) of every chunk of a file up front"""
+        last = file_size - chunk_size
+        return [(offset, chunk_size if offset <= last else file_size - offset)
+                for offset in range(0, file_size, chunk_size)]
@@ -1,6 +1,10 @@
 import asyncio
+import hashlib
+import json
+from collections import deque
 from .. import logger
 from . import file_manager
+from .chunk_manager import ChunkManager
 from ..util.error_handler import ErrorType
 
 
@@ -20,6 +24,9 @@ class DownloadManager:
         self.total_size = 0
         self.request_timeout_ms = 5000
         self.max_retries = 3
+        self.window_size = 16
+        self._hasher = hashlib.sha256()
+        self._total_chunks = 0
 
     async def download_file(self, stream_id: str, output_path: str, expected_size: int = 0) -> bool:
         """Download a file from the server.
@@ -38,6 +45,8 @@ class DownloadManager:
         self.bytes_downloaded = 0
         self.total_size = expected_size
         self.last_error = ""
+        self._hasher = hashlib.sha256()
+        self._total_chunks = 0
 
         try:
             # Create output directory if needed
@@ -47,90 +56,26 @@ class DownloadManager:
                 os.makedirs(output_dir, exist_ok=True)
                 logger.debug(f"Created output directory: {output_dir}")
 
-            downloaded_chunks = []
-            offset = 0
-            has_more_data = True
-
-            while has_more_data:
-                retries = 0
-                chunk_data = None
-
-                while retries < self.max_retries and chunk_data is None:
-                    # Clear any pending messages
-                    # In Python implementation, we might not have a clearMessages() method
-                    # So we'll proceed with the download request
-
-                    if not await self._send_get_request(stream_id, offset, file_manager.CHUNK_SIZE):
-                        return await self._handle_protocol_error("Failed to send GET request", stream_id)
-
-                    # Receive binary data with timeout
-                    try:
-                        data = await self._receive_with_timeout(file_manager.CHUNK_SIZE)
-                        chunk_data = data
-                    except asyncio.TimeoutError:
-                        if retries < self.max_retries - 1:
-                            logger.warning(
-                                f"No data received at offset: {offset}, retry {retries + 1}/{self.max_retries}")
-                            await asyncio.sleep(0.1)  # 100ms wait
-                        retries += 1
-                        continue
-
-                    if chunk_data is None:
-                        if await self._is_no_data_error():
-                            # Server explicitly said no data available - download complete
-                            logger.info(
-                                f"Download completed at offset: {offset} (no more data available)")
-                            has_more_data = False
-                            break
-                        retries += 1
-                        if retries < self.max_retries:
-                            logger.warning(
-                                f"No data received at offset: {offset}, retry {retries}/{self.max_retries}")
-                            await asyncio.sleep(0.1)  # 100ms wait
-
-                # If we broke out due to no more data, exit the loop
-                if not has_more_data:
-                    break
-
-                if chunk_data is None:
-                    # Failed after all retries
-                    error_msg = f"Download failed at offset: {offset} after {self.max_retries} retries"
-                    if self.error_handler:
-                        self.error_handler.report_error(
-                            ErrorType.TIMEOUT_ERROR,
-                            error_msg, stream_id, False
-                        )
-                    logger.error(error_msg)
-                    return False
-
-                if chunk_data is not None:
-                    downloaded_chunks.append(chunk_data)
-                    self.bytes_downloaded += len(chunk_data)
-                    offset += len(chunk_data)
-
-                    if len(downloaded_chunks) % 100 == 0:
-                        logger.info(
-                            f"Download progress: {self.bytes_downloaded} bytes, {len(downloaded_chunks)} chunks")
-
-                    # Check if we received less data than requested - indicates end of file
-                    if len(chunk_data) < file_manager.CHUNK_SIZE:
-                        logger.info(
-                            f"Download completed at offset: {offset} (received partial chunk)")
-                        has_more_data = False
-
-            # Write all chunks to file
-            if not await self.file_manager.open_for_writing(output_path):
+            # Stream chunks to disk as they arrive instead of buffering the whole file
+            if not await self.file_manager.open_for_writing(output_path, expected_size):
                 return await self._handle_protocol_error("Failed to open output file for writing", output_path)
 
-            for chunk in downloaded_chunks:
-                if not await self.file_manager.write(chunk):
-                    await self.file_manager.close_writer()
-                    return await self._handle_protocol_error("Failed to write chunk to file", output_path)
-
+            try:
+                if expected_size > 0:
+                    success = await self._download_pipelined(stream_id, output_path, expected_size)
+                else:
+                    success = await self._download_sequential(stream_id, output_path)
+            except BaseException:
+                # A failing close must not replace the download error
+                await self.file_manager.close_writer(suppress_errors=True)
+                raise
             await self.file_manager.close_writer()
 
+            if not success:
+                return False
+
             logger.info(
-                f"Download completed - Total chunks: {len(downloaded_chunks)}, Total bytes: {self.bytes_downloaded}")
+                f"Download completed - Total chunks: {self._total_chunks}, Total bytes: {self.bytes_downloaded}")
             return True
 
         except Exception as e:
@@ -151,6 +96,14 @@ class DownloadManager:
         """
         return self.last_error
 
+    def get_checksum(self) -> str:
+        """Get SHA-256 checksum of the downloaded data, computed as chunks arrive.
+
+        Returns:
+            Hex digest string
+        """
+        return self._hasher.hexdigest()
+
     def get_progress(self) -> float:
         """Get download progress (0.0 to 1.0).
 
@@ -177,6 +130,14 @@ class DownloadManager:
         """
         self.request_timeout_ms = timeout_ms
 
+    def set_window_size(self, window_size: int):
+        """Set maximum number of GET requests in flight.
+
+        Args:
+            window_size: Number of outstanding requests (1 disables pipelining)
+        """
+        self.window_size = max(1, window_size)
+
     def set_max_retries(self, max_retries: int):
         """Set maximum retry attempts for failed requests.
 
@@ -194,6 +155,183 @@ class DownloadManager:
         logger.debug(f"Received server response during download: {message}")
         # Handle responses if needed
 
+    async def _download_sequential(self, stream_id: str, output_path: str) -> bool:
+        """Download chunk by chunk until the server returns a partial chunk.
+        Used when the file size is not known in advance.
+
+        Args:
+            stream_id: Stream identifier to download from
+            output_path: Path of the file being written
+
+        Returns:
+            True if download was successful
+        """
+        offset = 0
+        has_more_data = True
+
+        while has_more_data:
+            retries = 0
+            chunk_data = None
+
+            while retries < self.max_retries and chunk_data is None:
+                # Clear any pending messages
+                # In Python implementation, we might not have a clearMessages() method
+                # So we'll proceed with the download request
+
+                if not await self._send_get_request(stream_id, offset, file_manager.CHUNK_SIZE):
+                    return await self._handle_protocol_error("Failed to send GET request", stream_id)
+
+                # Receive binary data with timeout
+                try:
+                    data = await self._receive_with_timeout(file_manager.CHUNK_SIZE)
+                    chunk_data = data
+                except TimeoutError:
+                    if await self._is_no_data_error():
+                        # Server explicitly said no data available - download complete
+                        logger.info(
+                            f"Download completed at offset: {offset} (no more data available)")
+                        has_more_data = False
+                        break
+                    if retries < self.max_retries - 1:
+                        logger.warning(
+                            f"No data received at offset: {offset}, retry {retries + 1}/{self.max_retries}")
+                        await asyncio.sleep(0.1)  # 100ms wait
+                    retries += 1
+                    continue
+
+                if chunk_data is None:
+                    if await self._is_no_data_error():
+                        # Server explicitly said no data available - download complete
+                        logger.info(
+                            f"Download completed at offset: {offset} (no more data available)")
+                        has_more_data = False
+                        break
+                    retries += 1
+                    if retries < self.max_retries:
+                        logger.warning(
+                            f"No data received at offset: {offset}, retry {retries}/{self.max_retries}")
+                        await asyncio.sleep(0.1)  # 100ms wait
+
+            # If we broke out due to no more data, exit the loop
+            if not has_more_data:
+                break
+
+            if chunk_data is None:
+                # Failed after all retries
+                error_msg = f"Download failed at offset: {offset} after {self.max_retries} retries"
+                if self.error_handler:
+                    self.error_handler.report_error(
+                        ErrorType.TIMEOUT_ERROR,
+                        error_msg, stream_id, False
+                    )
+                logger.error(error_msg)
+                return False
+
+            if chunk_data is not None:
+                if not await self._store_chunk(chunk_data, output_path):
+                    return False
+                offset += len(chunk_data)
+
+                # Check if we received less data than requested - indicates end of file
+                if len(chunk_data) < file_manager.CHUNK_SIZE:
+                    logger.info(
+                        f"Download completed at offset: {offset} (received partial chunk)")
+                    has_more_data = False
+
+        return True
+
+    async def _download_pipelined(self, stream_id: str, output_path: str, expected_size: int) -> bool:
+        """Download with up to window_size GET requests in flight.
+        The server answers GETs on a connection in the order they were sent,
+        so responses are matched to requests by order without any reordering.
+
+        Args:
+            stream_id: Stream identifier to download from
+            output_path: Path of the file being written
+            expected_size: Size of the file in bytes
+
+        Returns:
+            True if download was successful
+        """
+        chunk_plan = iter(ChunkManager.plan(expected_size, file_manager.CHUNK_SIZE))
+        in_flight = deque()
+        remaining = ChunkManager.calculate_chunks_needed(expected_size, file_manager.CHUNK_SIZE)
+
+        # Per-chunk hot loop: resolve bound methods once instead of per chunk
+        receive = self._receive_with_timeout
+        write_at = self.file_manager.write_at
+        update_hash = self._hasher.update
+        pop_request = in_flight.popleft
+
+        async def send_next() -> bool:
+            nonlocal remaining
+            request = next(chunk_plan)
+            remaining -= 1
+            if not await self._send_get_request(stream_id, *request):
+                return False
+            in_flight.append(request)
+            return True
+
+        while remaining and len(in_flight) < self.window_size:
+            if not await send_next():
+                return await self._handle_protocol_error("Failed to send GET request", stream_id)
+
+        while in_flight:
+            offset, length = pop_request()
+            try:
+                chunk_data = await receive(length)
+            except TimeoutError:
+                error_msg = f"Download failed at offset: {offset}, no data received"
+                if self.error_handler:
+                    self.error_handler.report_error(
+                        ErrorType.TIMEOUT_ERROR,
+                        error_msg, stream_id, False
+                    )
+                logger.error(error_msg)
+                self.last_error = error_msg
+                return False
+
+            # Keep the window full before doing local work on the received chunk
+            if remaining and not await send_next():
+                return await self._handle_protocol_error("Failed to send GET request", stream_id)
+
+            if len(chunk_data) != length:
+                return await self._handle_protocol_error(
+                    f"Expected {length} bytes at offset {offset}, got {len(chunk_data)}", stream_id)
+
+            if not await write_at(offset, chunk_data):
+                return await self._handle_protocol_error("Failed to write chunk to file", output_path)
+            update_hash(chunk_data)
+            self.bytes_downloaded += length
+            self._total_chunks += 1
+
+            if self._total_chunks % 100 == 0:
+                logger.info("Download progress: %d bytes, %d chunks",
+                            self.bytes_downloaded, self._total_chunks)
+
+        return True
+
+    async def _store_chunk(self, chunk_data: bytes, output_path: str) -> bool:
+        """Write a received chunk to the output file and update progress.
+
+        Args:
+            chunk_data: Received chunk
+            output_path: Path of the file being written
+
+        Returns:
+            True if the chunk was written
+        """
+        if not await self.file_manager.write(chunk_data):
+            return await self._handle_protocol_error("Failed to write chunk to file", output_path)
+        self._hasher.update(chunk_data)
+        self.bytes_downloaded += len(chunk_data)
+        self._total_chunks += 1
+
+        if self._total_chunks % 100 == 0:
+            logger.info("Download progress: %d bytes, %d chunks",
+                        self.bytes_downloaded, self._total_chunks)
+        return True
+
     async def _send_get_request(self, stream_id: str, offset: int, length: int) -> bool:
         """Send a GET request for a specific chunk.
 
@@ -212,8 +350,6 @@ class DownloadManager:
                 'offset': offset,
                 'length': length
             })
-            logger.debug(
-                f"Sent get request - stream: {stream_id}, offset: {offset}, length: {length}")
             return True
         except Exception as e:
             if self.error_handler:
@@ -232,34 +368,13 @@ class DownloadManager:
             chunk_size: Expected chunk size
 
         Returns:
-            Received data or None if timeout
-        """
-        try:
-            # Clear any pending text messages first
-            while True:
-                try:
-                    # Try to peek at the next message without blocking
-                    message = await asyncio.wait_for(
-                        self.client.receive_message(),
-                        timeout=0.01
-                    )
-                    # If it's a text message, log and discard it
-                    if isinstance(message, str):
-                        logger.debug(
-                            f"Discarding pending text message before binary receive: {message}")
-                    elif isinstance(message, bytes):
-                        # Put binary data back into queue for receive_binary to handle
-                        await self.client.message_queue.put(message)
-                        break
-                except asyncio.TimeoutError:
-                    # No message available, proceed to wait for binary
-                    break
+            Received data
 
-            # Simulate timeout using asyncio.wait_for
-            data = await asyncio.wait_for(self.client.receive_binary(), timeout=self.request_timeout_ms/1000.0)
-            return data
-        except asyncio.TimeoutError:
-            raise asyncio.TimeoutError()
+        Raises:
+            TimeoutError: If no data arrives within the request timeout
+        """
+        async with asyncio.timeout(self.request_timeout_ms / 1000.0):
+            return await self.client.receive_binary()
 
     async def _is_no_data_error(self) -> bool:
         """Check if the last message was an error message indicating no data available.
@@ -267,9 +382,16 @@ class DownloadManager:
         Returns:
             True if last error message indicates no data available
         """
-        # In the current Python WebSocket implementation, we don't have separate
-        # text/binary message queues, so we'll return False for now
-        # This would need to be implemented based on the specific server response
+        # Text messages are queued separately from binary data, so an ERROR
+        # response to a GET would be waiting in the text queue
+        while not self.client.text_queue.empty():
+            message = self.client.text_queue.get_nowait()
+            logger.debug(f"Pending text message after GET: {message}")
+            try:
+                if json.loads(message).get('type') == 'ERROR':
+                    return True
+            except json.JSONDecodeError:
+                continue
         return False
 
     async def _handle_protocol_error(self, message: str, context: str) -> bool:
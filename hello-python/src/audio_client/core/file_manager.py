@@ -1,10 +1,30 @@
 """File I/O operations with SHA-256 checksum calculation"""
 
+import asyncio
 import hashlib
+import mmap
 import os
 from pathlib import Path
 
-CHUNK_SIZE = 65536  # 64KB
+from .. import logger
+
+try:
+    from blake3 import blake3
+except ImportError:  # optional accelerated hash
+    blake3 = None
+
+CHUNK_SIZE = 1 << 20  # 1MB
+WRITE_BUFFER_SIZE = 1 << 20  # Pending bytes that trigger a FileWriter flush
+MAX_WRITE_IOV = 512  # Stay below IOV_MAX for a single writev call
+
+
+def pick_chunk_size(file_size: int) -> int:
+    """Pick a chunk size that keeps the frame count low for large files"""
+    if file_size < (1 << 20):
+        return 64 * 1024
+    if file_size < (100 << 20):
+        return CHUNK_SIZE
+    return 4 << 20
 
 
 async def get_file_size(file_path: str) -> int:
@@ -13,14 +33,22 @@ async def get_file_size(file_path: str) -> int:
 
 
 async def read_chunk(file_path: str, offset: int, length: int) -> bytes:
-    """Read a chunk of data from file"""
-    with open(file_path, 'rb') as f:
+    """Read a chunk of data from file.
+
+    Opens the file on every call; use MappedFile to read many chunks
+    of one file.
+    """
+    with open(file_path, 'rb', buffering=0) as f:
         f.seek(offset)
         return f.read(length)
 
 
 async def write_chunk(file_path: str, data: bytes, append: bool):
-    """Write a chunk of data to file"""
+    """Write a chunk of data to file.
+
+    Opens the file on every call; use FileWriter (or ChunkedWriter) to
+    write many chunks through a single descriptor.
+    """
     # Ensure parent directory exists
     Path(file_path).parent.mkdir(parents=True, exist_ok=True)
     
@@ -29,67 +57,245 @@ async def write_chunk(file_path: str, data: bytes, append: bool):
         f.write(data)
 
 
-async def calculate_checksum(file_path: str) -> str:
-    """Calculate SHA-256 checksum of file"""
-    sha256 = hashlib.sha256()
+async def calculate_checksum(file_path: str, algorithm: str = "sha256") -> str:
+    """Calculate checksum of file (SHA-256 by default, BLAKE3 if installed and requested)"""
+    return await asyncio.to_thread(calculate_checksum_sync, file_path, algorithm)
+
+
+def calculate_checksum_sync(file_path: str, algorithm: str = "sha256") -> str:
+    """Blocking checksum calculation, safe to run in a worker thread.
+
+    The hash functions release the GIL while hashing, so several files
+    can be hashed in parallel threads.
+    """
+    if algorithm == "blake3":
+        if blake3 is None:
+            raise ValueError("blake3 is not installed")
+        hasher = blake3(max_threads=blake3.AUTO)
+        hasher.update_mmap(file_path)
+        return hasher.hexdigest()
 
+    # The read/update loop runs entirely in C
     with open(file_path, 'rb') as f:
-        while True:
-            data = f.read(CHUNK_SIZE)
-            if not data:
-                break
-            sha256.update(data)
+        return hashlib.file_digest(f, 'sha256').hexdigest()
 
-    return sha256.hexdigest()
+
+# Memory-mapped file class for zero-copy reads
+class MappedFile:
+    """Read-only memory mapping of a whole file"""
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.mmap = None
+        fd = os.open(file_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+        try:
+            self.size = os.fstat(fd).st_size
+            if self.size > 0:
+                self.mmap = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+                if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                    self.mmap.madvise(mmap.MADV_SEQUENTIAL)
+                    self.mmap.madvise(mmap.MADV_WILLNEED)
+        finally:
+            # The mapping keeps its own reference to the file
+            os.close(fd)
+        self.view = memoryview(self.mmap) if self.mmap is not None else memoryview(b'')
+
+    def read(self, offset: int, length: int) -> memoryview:
+        """Return a zero-copy view of up to length bytes at offset"""
+        return self.view[offset:offset + length]
+
+    def close(self) -> None:
+        """Release the view and unmap the file"""
+        self.view.release()
+        if self.mmap is not None:
+            self.mmap.close()
+            self.mmap = None
+
+    def __enter__(self) -> 'MappedFile':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
 
 # File writer class for streaming writes
 class FileWriter:
-    """File writer for streaming chunk writes"""
+    """File writer for streaming chunk writes.
+
+    When the final size is known the file is preallocated (posix_fallocate,
+    or ftruncate where unsupported) and mapped, so chunks are copied straight
+    into the page cache at their offset and the file is trimmed to the
+    written length on close. Otherwise chunks
+    are queued by reference and written with a single gather write
+    (os.writev) once about buffer_size bytes are pending, so callers must
+    not modify a chunk after passing it to write().
+    """
 
-    def __init__(self, output_path: str):
+    def __init__(self, output_path: str, buffer_size: int = WRITE_BUFFER_SIZE):
         self.output_path = output_path
-        self.file = None
+        self.buffer_size = buffer_size
+        self.fd = None
         self.is_open = False
+        self._iov = []
+        self._pending = 0
+        self._mmap = None
+        self._view = None
+        self._offset = 0
+        self._end = 0
 
-    async def open(self) -> bool:
-        """Open file for writing"""
+    async def open(self, expected_size: int = 0) -> bool:
+        """Open file for writing, mapping it when expected_size is known"""
         try:
             # Ensure parent directory exists
             Path(self.output_path).parent.mkdir(parents=True, exist_ok=True)
-            self.file = open(self.output_path, 'wb')
+            flags = os.O_RDWR | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+            self.fd = os.open(self.output_path, flags, 0o644)
+            self._iov = []
+            self._pending = 0
+            self._offset = 0
+            self._end = 0
+            if expected_size > 0:
+                try:
+                    self._preallocate(expected_size)
+                    self._mmap = mmap.mmap(self.fd, expected_size, access=mmap.ACCESS_WRITE)
+                    self._view = memoryview(self._mmap)
+                except Exception:
+                    # Don't leak the descriptor (or mapping) of a half-opened file
+                    if self._mmap is not None:
+                        self._mmap.close()
+                        self._mmap = None
+                    os.close(self.fd)
+                    self.fd = None
+                    raise
             self.is_open = True
             return True
         except Exception as e:
             return False
 
     async def write(self, data: bytes) -> bool:
-        """Write data to the file"""
-        if not self.is_open or self.file is None:
+        """Write data at the current end of the file"""
+        if not self.is_open or self.fd is None:
             return False
+        if self._view is not None:
+            if not await self.write_at(self._offset, data):
+                return False
+            self._offset += len(data)
+            return True
         try:
-            self.file.write(data)
+            self._iov.append(data)
+            self._pending += len(data)
+            self._offset += len(data)
+            self._end = self._offset
+            if self._pending >= self.buffer_size or len(self._iov) >= MAX_WRITE_IOV:
+                self._flush_iov()
             return True
         except Exception:
             return False
 
-    async def close(self) -> None:
-        """Close the file"""
-        if self.file is not None:
-            self.file.close()
-            self.file = None
-        self.is_open = False
+    async def write_at(self, offset: int, data: bytes) -> bool:
+        """Write data at an absolute offset, in any order"""
+        if not self.is_open or self.fd is None:
+            return False
+        try:
+            end = offset + len(data)
+            if self._view is not None:
+                if end > len(self._view):
+                    return False
+                self._view[offset:end] = data
+            else:
+                self._flush_iov()
+                view = memoryview(data)
+                while view:
+                    view = view[os.pwrite(self.fd, view, offset):]
+                    offset = end - len(view)
+            self._end = max(self._end, end)
+            return True
+        except Exception:
+            return False
+
+    async def close(self, suppress_errors: bool = False) -> None:
+        """Flush pending chunks and close the file.
+
+        With suppress_errors a failure is logged instead of raised, so
+        cleanup while another exception propagates does not replace it.
+        """
+        try:
+            try:
+                if self._view is not None:
+                    self._view.release()
+                    self._view = None
+                    self._mmap.close()
+                    self._mmap = None
+                    # Drop any preallocated tail that was never written
+                    os.ftruncate(self.fd, self._end)
+                elif self.fd is not None:
+                    self._flush_iov()
+                if self.fd is not None and hasattr(os, 'posix_fadvise'):
+                    # The written data is not read back here; let the kernel reclaim it
+                    os.posix_fadvise(self.fd, 0, 0, os.POSIX_FADV_DONTNEED)
+            finally:
+                self._iov = []
+                self._pending = 0
+                if self.fd is not None:
+                    os.close(self.fd)
+                    self.fd = None
+                self.is_open = False
+        except Exception as e:
+            if not suppress_errors:
+                raise
+            logger.warn(f"Error closing {self.output_path}: {e}")
+
+    async def __aenter__(self) -> 'FileWriter':
+        if not await self.open():
+            raise OSError(f"Failed to open file for writing: {self.output_path}")
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close(suppress_errors=exc_type is not None)
+
+    def _preallocate(self, size: int) -> None:
+        """Reserve disk blocks for the whole file up front"""
+        if hasattr(os, 'posix_fallocate'):
+            try:
+                os.posix_fallocate(self.fd, 0, size)
+                return
+            except OSError:
+                pass  # Not supported by this filesystem
+        os.ftruncate(self.fd, size)
+
+    def _flush_iov(self) -> None:
+        """Write all pending chunks, handling short writes"""
+        iov = self._iov
+        while iov:
+            if hasattr(os, 'writev'):
+                written = os.writev(self.fd, iov)
+            else:
+                written = os.write(self.fd, iov[0])
+            # Drop fully written chunks and trim a partially written one
+            done = 0
+            while done < len(iov) and written >= len(iov[done]):
+                written -= len(iov[done])
+                done += 1
+            iov = iov[done:]
+            if written:
+                iov[0] = memoryview(iov[0])[written:]
+        self._iov = []
+        self._pending = 0
+
+
+# Alias for callers that write chunk streams outside download_manager
+ChunkedWriter = FileWriter
 
 
 # Global file writer instance for download_manager compatibility
 _file_writer = None
 
 
-async def open_for_writing(file_path: str) -> bool:
+async def open_for_writing(file_path: str, expected_size: int = 0) -> bool:
     """Open file for writing (download_manager compatibility)"""
     global _file_writer
     _file_writer = FileWriter(file_path)
-    return await _file_writer.open()
+    return await _file_writer.open(expected_size)
 
 
 async def write(data: bytes) -> bool:
@@ -100,9 +306,17 @@ async def write(data: bytes) -> bool:
     return await _file_writer.write(data)
 
 
-async def close_writer() -> None:
-    """Close the file writer (download_manager compatibility)"""
+async def write_at(offset: int, data: bytes) -> bool:
+    """Write data at an absolute offset of the open file (download_manager compatibility)"""
+    global _file_writer
+    if _file_writer is None:
+        return False
+    return await _file_writer.write_at(offset, data)
+
+
+async def close_writer(suppress_errors: bool = False) -> None:
+    """Close the file writer (download_manager compatibility; see FileWriter.close)"""
     global _file_writer
     if _file_writer is not None:
-        await _file_writer.close()
-        _file_writer = None
+        writer, _file_writer = _file_writer, None
+        await writer.close(suppress_errors)
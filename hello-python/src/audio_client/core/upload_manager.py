@@ -4,9 +4,11 @@ Matches the Java UploadManager interface.
 """
 
 import asyncio
+import hashlib
 from .. import logger
 from . import file_manager
-from ..util.stream_id_generator import StreamIdGenerator
+from .chunk_manager import ChunkManager
+from ..util.stream_id_generator import default_generator
 from ..util.error_handler import ErrorType
 
 
@@ -24,11 +26,14 @@ class UploadManager:
         self.chunk_manager = chunk_manager
         self.error_handler = error_handler
         self.performance_monitor = performance_monitor
-        self.stream_id_generator = stream_id_generator or StreamIdGenerator()
+        self.stream_id_generator = stream_id_generator or default_generator()
         self.progress_callback = None
         self.response_timeout_ms = 5000
-        self.upload_delay_ms = 10
+        self.upload_delay_ms = 0  # Optional throttle between batches, off by default
+        self.chunk_size = 0  # 0 picks a chunk size from the file size
+        self.batch_size = 8  # Chunks in flight per gathered batch, tune with set_batch_size
         self.message_pause_ms = 0.5  # 500ms in seconds for asyncio.sleep
+        self._hasher = hashlib.sha256()
 
     async def upload_file(self, file_path: str) -> str:
         """Upload a file to the server.
@@ -40,7 +45,10 @@ class UploadManager:
             Generated stream ID if successful, empty string if failed
         """
         import os
-        if not os.path.exists(file_path):
+        # One stat call serves both the existence check and the size
+        try:
+            file_size = os.stat(file_path).st_size
+        except FileNotFoundError:
             if self.error_handler:
                 self.error_handler.report_error(
                     ErrorType.FILE_IO_ERROR,
@@ -48,9 +56,17 @@ class UploadManager:
                 )
             logger.error(f"File not found: {file_path}")
             return ""
+        except (OSError, ValueError) as e:
+            # Unusable path (permissions, embedded NUL, ...): fail like a read error
+            if self.error_handler:
+                self.error_handler.report_error(
+                    ErrorType.FILE_IO_ERROR,
+                    f"Failed to read file: {str(e)}", file_path, False
+                )
+            logger.error(f"Upload failed for file: {file_path}")
+            return ""
 
         try:
-            file_size = os.path.getsize(file_path)
             stream_id = self.stream_id_generator.generate_short()
 
             logger.info(f"Starting upload - File: {os.path.basename(file_path)}, "
@@ -60,20 +76,18 @@ class UploadManager:
                 self.performance_monitor.start_upload()
 
             # Send START message
-            if not await self._send_start_message(stream_id):
+            if not await self._send_start_message(stream_id, file_size):
                 return ""
 
             # Wait for "STARTED" response from server
             try:
-                response = await asyncio.wait_for(
-                    self.client.receive_control_message(),
-                    timeout=self.response_timeout_ms / 1000.0
-                )
+                async with asyncio.timeout(self.response_timeout_ms / 1000.0):
+                    response = await self.client.receive_control_message()
                 if response.get('type') != 'STARTED':
                     logger.error(
                         f"Expected 'STARTED' response, got: {response}")
                     return ""
-            except asyncio.TimeoutError:
+            except TimeoutError:
                 logger.error("Timeout waiting for 'started' response")
                 return ""
 
@@ -91,14 +105,12 @@ class UploadManager:
 
             # Wait for "stopped" response from server
             try:
-                response = await asyncio.wait_for(
-                    self.client.receive_control_message(),
-                    timeout=self.response_timeout_ms / 1000.0
-                )
+                async with asyncio.timeout(self.response_timeout_ms / 1000.0):
+                    response = await self.client.receive_control_message()
                 if response.get('type') != 'STOPPED':
                     logger.warning(
                         f"Expected 'STOPPED' response, got: {response}")
-            except asyncio.TimeoutError:
+            except TimeoutError:
                 logger.warning(
                     "Timeout waiting for 'stopped' response (upload may still be complete)")
 
@@ -126,6 +138,14 @@ class UploadManager:
         """
         self.progress_callback = callback
 
+    def get_checksum(self) -> str:
+        """Get SHA-256 checksum of the uploaded data, computed as chunks are sent.
+
+        Returns:
+            Hex digest string
+        """
+        return self._hasher.hexdigest()
+
     def set_response_timeout(self, timeout_ms: int):
         """Set timeout for server responses.
 
@@ -135,13 +155,29 @@ class UploadManager:
         self.response_timeout_ms = timeout_ms
 
     def set_upload_delay(self, delay_ms: int):
-        """Set delay between chunk uploads.
+        """Set delay between chunk batch uploads (0 disables throttling).
 
         Args:
             delay_ms: Delay in milliseconds
         """
         self.upload_delay_ms = delay_ms
 
+    def set_chunk_size(self, chunk_size: int):
+        """Set a fixed upload chunk size.
+
+        Args:
+            chunk_size: Bytes per chunk (0 picks one from the file size)
+        """
+        self.chunk_size = max(0, chunk_size)
+
+    def set_batch_size(self, batch_size: int):
+        """Set number of chunks sent together per batch.
+
+        Args:
+            batch_size: Chunks per batch (1 sends chunks one at a time)
+        """
+        self.batch_size = max(1, batch_size)
+
     def handle_server_response(self, message: str):
         """Handle server response message (called from main message router).
 
@@ -151,20 +187,25 @@ class UploadManager:
         logger.debug(f"Received server response during upload: {message}")
         # Handle acknowledgments if needed
 
-    async def _send_start_message(self, stream_id: str) -> bool:
+    async def _send_start_message(self, stream_id: str, file_size: int = 0) -> bool:
         """Send START message to begin streaming.
 
         Args:
             stream_id: Stream identifier
+            file_size: Upload size, announced so the server can preallocate
+                its cache file (0 leaves it out)
 
         Returns:
             True if successful
         """
         try:
-            await self.client.send_control_message({
+            message = {
                 'type': 'START',
                 'streamId': stream_id
-            })
+            }
+            if file_size > 0:
+                message['totalSize'] = file_size
+            await self.client.send_control_message(message)
             logger.info(f"Sent start message for stream: {stream_id}")
             return True
         except Exception as e:
@@ -186,37 +227,86 @@ class UploadManager:
         Returns:
             True if successful
         """
-        offset = 0
         total_chunks = 0
         total_bytes_transferred = 0
+        self._hasher = hashlib.sha256()
+        chunk_size = self.chunk_size or file_manager.pick_chunk_size(file_size)
+        chunk_plan = ChunkManager.plan(file_size, chunk_size)
 
-        # Read the entire file
-        with open(file_path, 'rb') as f:
-            file_data = f.read()
-
-        while offset < len(file_data):
-            chunk_length = min(file_manager.CHUNK_SIZE,
-                               len(file_data) - offset)
-            chunk = file_data[offset:offset + chunk_length]
-
-            await self.client.send_binary(chunk)
-            total_bytes_transferred += chunk_length
-            total_chunks += 1
-
-            # Call progress callback if set
-            if self.progress_callback:
-                self.progress_callback(total_bytes_transferred, file_size)
-
-            if self.upload_delay_ms > 0:
-                # Convert ms to seconds
-                await asyncio.sleep(self.upload_delay_ms / 1000.0)
-
-            offset += chunk_length
+        # Map the file once and send zero-copy views of each chunk
+        try:
+            mapped_file = file_manager.MappedFile(file_path)
+        except OSError as e:
+            logger.error(f"Failed to open file for reading: {file_path}: {e}")
+            return False
+        if mapped_file.size < file_size:
+            logger.error(f"Unexpected end of file at offset: {mapped_file.size}")
+            mapped_file.close()
+            return False
 
-            if total_chunks % 100 == 0:
-                progress_percent = total_bytes_transferred * 100.0 / file_size
-                logger.info(f"Upload progress: {total_bytes_transferred} / {file_size} bytes "
-                            f"({progress_percent:.1f}%)")
+        update_hash = self._hasher.update
+
+        def hash_range(start, end):
+            # Runs in a worker thread: hashing touches every page of the batch,
+            # so disk reads happen off the event loop. The worker slices and
+            # releases its own view; the executor only ever holds offsets,
+            # which it may keep alive after the future resolves.
+            with mapped_file.view[start:end] as data:
+                update_hash(data)
+
+        def hash_batch(plan):
+            first_offset = plan[0][0]
+            last_offset, last_length = plan[-1]
+            return asyncio.ensure_future(
+                asyncio.to_thread(hash_range, first_offset, last_offset + last_length))
+
+        batches = [chunk_plan[start:start + self.batch_size]
+                   for start in range(0, len(chunk_plan), self.batch_size)]
+        pending_hash = None
+        next_progress_bytes = 1  # Byte count at which the next percent is reached
+        next_log_percent = 10
+        try:
+            if batches:
+                pending_hash = hash_batch(batches[0])
+            for index, plan in enumerate(batches):
+                # Page in the next batch while this one is on the wire
+                await pending_hash
+                pending_hash = None
+                if index + 1 < len(batches):
+                    pending_hash = hash_batch(batches[index + 1])
+
+                # Frames are written in task order, so the stream stays sequential
+                batch = [mapped_file.view[offset:offset + length] for offset, length in plan]
+                try:
+                    await asyncio.gather(*[self.client.send_binary(chunk) for chunk in batch])
+                finally:
+                    # Views into the mapping must be gone before it can be unmapped
+                    for chunk in batch:
+                        chunk.release()
+
+                for _, chunk_length in plan:
+                    total_bytes_transferred += chunk_length
+                total_chunks += len(plan)
+
+                # Report progress once per percent rather than once per chunk
+                if total_bytes_transferred >= next_progress_bytes:
+                    if self.progress_callback:
+                        self.progress_callback(total_bytes_transferred, file_size)
+                    percent = total_bytes_transferred * 100 // file_size
+                    if percent >= next_log_percent:
+                        logger.info("Upload progress: %d / %d bytes (%d%%)",
+                                    total_bytes_transferred, file_size, percent)
+                        next_log_percent = percent - percent % 10 + 10
+                    next_progress_bytes = -(-(percent + 1) * file_size // 100)
+
+                if self.upload_delay_ms > 0:
+                    # Convert ms to seconds
+                    await asyncio.sleep(self.upload_delay_ms / 1000.0)
+        finally:
+            # The worker thread must be done with its view before unmapping
+            if pending_hash is not None:
+                await asyncio.gather(pending_hash, return_exceptions=True)
+            mapped_file.close()
 
         logger.info(
             f"Sent {total_chunks} chunks ({total_bytes_transferred} bytes)")
@@ -253,13 +343,11 @@ async def upload(ws, file_path: str, file_size: int) -> str:
     from .chunk_manager import ChunkManager
     from ..util.error_handler import ErrorHandler
     from ..util.performance_monitor import PerformanceMonitor
-    from ..util.stream_id_generator import StreamIdGenerator
 
     chunk_manager = ChunkManager()
     error_handler = ErrorHandler()
     performance_monitor = PerformanceMonitor(file_size)
-    stream_id_generator = StreamIdGenerator()
 
     upload_manager = UploadManager(ws, file_manager, chunk_manager, error_handler,
-                                   performance_monitor, stream_id_generator)
+                                   performance_monitor)
     return await upload_manager.upload_file(file_path)
@@ -2,22 +2,70 @@
 
 import json
 import asyncio
-from typing import Optional, Dict, Any
+import collections
+import socket
+from typing import Optional, Dict, Any, Union
 import websockets
 from .. import logger
 
+MAX_MESSAGE_SIZE = 16 * 1024 * 1024  # Room for 1MB chunk frames and larger GETs
+
+
+class _FrameQueue:
+    """Unbounded single-consumer queue of received frames.
+
+    A deque plus an Event: put_nowait() is an append, and get() only waits
+    when the deque is empty, without asyncio.Queue's getter bookkeeping.
+    Frames are never dropped, since every one is a reply the client awaits.
+    """
+
+    def __init__(self):
+        self._frames = collections.deque()
+        self._ready = asyncio.Event()
+
+    def put_nowait(self, frame):
+        """Append a frame and wake the consumer"""
+        self._frames.append(frame)
+        self._ready.set()
+
+    async def get(self):
+        """Return the oldest frame, waiting for one if none is queued"""
+        frames = self._frames
+        while not frames:
+            self._ready.clear()
+            await self._ready.wait()
+        return frames.popleft()
+
+    def empty(self) -> bool:
+        return not self._frames
+
 
 class WebSocketClient:
     """WebSocket client wrapper"""
     
-    def __init__(self, uri: str):
+    def __init__(self, uri: str, socket_buffer_size: int = 0):
+        """
+        Args:
+            uri: WebSocket server URI
+            socket_buffer_size: Fixed kernel send/receive buffer size in bytes;
+                0 keeps the kernel's autotuned buffers. A fixed size turns
+                autotuning off and is capped at net.core.[rw]mem_max.
+        """
         self.uri = uri
+        self.socket_buffer_size = socket_buffer_size
         self.ws: Optional[websockets.WebSocketClientProtocol] = None
-        self.message_queue = asyncio.Queue()
+        # Inbound frames are split by type so binary receives never have to
+        # skip over pending control messages
+        self.text_queue = _FrameQueue()
+        self.binary_queue = _FrameQueue()
     
     async def connect(self):
         """Connect to WebSocket server"""
-        self.ws = await websockets.connect(self.uri)
+        # Audio payloads are already compressed; permessage-deflate would only
+        # add a zlib pass and extra buffer copies per frame
+        self.ws = await websockets.connect(self.uri, compression=None, max_size=MAX_MESSAGE_SIZE)
+        if self.socket_buffer_size > 0:
+            self._tune_socket()
         # Start background task to handle incoming messages
         asyncio.create_task(self._message_handler())
     
@@ -27,11 +75,25 @@ class WebSocketClient:
             await self.ws.close()
             self.ws = None
     
+    def _tune_socket(self):
+        """Set fixed kernel socket buffer sizes (socket_buffer_size)"""
+        sock = self.ws.transport.get_extra_info('socket')
+        if sock is None:
+            return
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.socket_buffer_size)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.socket_buffer_size)
+        except OSError as e:
+            logger.debug(f"Could not resize socket buffers: {e}")
+    
     async def _message_handler(self):
         """Background task to handle incoming messages"""
         try:
             async for message in self.ws:
-                await self.message_queue.put(message)
+                if isinstance(message, str):
+                    self.text_queue.put_nowait(message)
+                else:
+                    self.binary_queue.put_nowait(message)
         except Exception:
             pass  # Connection closed
     
@@ -41,55 +103,39 @@ class WebSocketClient:
             raise RuntimeError("WebSocket is not connected")
         await self.ws.send(message)
     
-    async def send_binary(self, data: bytes):
-        """Send binary message"""
+    async def send_binary(self, data: Union[bytes, bytearray, memoryview]):
+        """Send binary message.
+
+        Any bytes-like object is accepted, so memoryview slices of a mapped
+        file are framed without first being copied into a bytes object.
+        """
         if not self.ws:
             raise RuntimeError("WebSocket is not connected")
         await self.ws.send(data)
     
-    async def receive_message(self):
-        """Receive next message from queue"""
-        return await self.message_queue.get()
+    async def receive_message(self) -> str:
+        """Receive next text message from queue"""
+        return await self.text_queue.get()
     
     async def receive_text(self) -> str:
         """Receive text message"""
         if not self.ws:
             raise RuntimeError("WebSocket is not connected")
         
-        message = await self.receive_message()
-        
-        if isinstance(message, bytes):
-            # Convert bytes to string
-            return message.decode('utf-8')
-        else:
-            return message
+        return await self.receive_message()
     
     async def receive_binary(self) -> bytes:
         """Receive binary message"""
         if not self.ws:
             raise RuntimeError("WebSocket is not connected")
         
-        message = await self.receive_message()
-        
-        if isinstance(message, bytes):
-            return message
-        elif isinstance(message, str):
-            # Check if it's an error message
-            try:
-                msg = json.loads(message)
-                if msg.get('type') == 'ERROR':
-                    raise RuntimeError(f"Server error: {msg.get('message')}")
-                else:
-                    raise RuntimeError(f"Expected binary message, got text: {message}")
-            except json.JSONDecodeError:
-                raise RuntimeError(f"Expected binary message, got text: {message}")
-        else:
-            return bytes(message)
+        return await self.binary_queue.get()
     
     async def send_control_message(self, msg: Dict[str, Any]):
         """Send control message (JSON)"""
         json_data = json.dumps(msg)
-        logger.debug(f"Sending control message: {json_data}")
+        # Sent once per chunk during downloads; formatted only when verbose
+        logger.debug("Sending control message: %s", json_data)
         await self.send_text(json_data)
     
     async def receive_control_message(self) -> Dict[str, Any]:
@@ -0,0 +1,20 @@
+"""Event loop selection for the client entry point"""
+
+import asyncio
+
+try:
+    import uvloop
+except ImportError:  # optional faster event loop (the uvloop extra)
+    uvloop = None
+
+
+def install_event_loop() -> bool:
+    """Make asyncio.run() use uvloop when it is installed.
+
+    Returns:
+        True if uvloop was installed, False if the default loop is kept
+    """
+    if uvloop is None:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
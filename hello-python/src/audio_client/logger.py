@@ -1,48 +1,79 @@
 """Logging utility with support for different log levels"""
 
-from datetime import datetime
+import logging
+import sys
+import time
 
-_verbose_enabled = False
+_log = logging.getLogger("audio_client")
+
+# Seconds-level timestamp prefix, reformatted only when the second changes
+_last_second = 0
+_last_prefix = ""
+
+
+class _Formatter(logging.Formatter):
+    """Formatter producing "[timestamp] [level] message" lines"""
+
+    _LEVEL_NAMES = {
+        logging.DEBUG: "debug",
+        logging.INFO: "info",
+        logging.WARNING: "warn",
+        logging.ERROR: "error",
+    }
+
+    def format(self, record: logging.LogRecord) -> str:
+        level = self._LEVEL_NAMES.get(record.levelno) or record.levelname.lower()
+        return f"[{_format_timestamp(record.created)}] [{level}] {record.getMessage()}"
+
+
+_handler = logging.StreamHandler(sys.stdout)
+_handler.setFormatter(_Formatter())
+_log.addHandler(_handler)
+_log.setLevel(logging.INFO)
+_log.propagate = False
 
 
 def init(verbose: bool):
     """Initialize logger with verbose flag"""
-    global _verbose_enabled
-    _verbose_enabled = verbose
+    _log.setLevel(logging.DEBUG if verbose else logging.INFO)
 
 
-def _format_timestamp() -> str:
-    """Format current timestamp"""
-    return datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+def _format_timestamp(created: float) -> str:
+    """Format a record timestamp"""
+    global _last_second, _last_prefix
+    second = int(created)
+    if second != _last_second:
+        _last_second = second
+        _last_prefix = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(second))
+    return f"{_last_prefix}.{int(created * 1000) % 1000:03d}"
 
 
-def info(message: str):
-    """Log info message"""
-    print(f"[{_format_timestamp()}] [info] {message}")
+def info(message: str, *args):
+    """Log info message (%-style args are only formatted when emitted)"""
+    _log.info(message, *args)
 
 
-def error(message: str):
+def error(message: str, *args):
     """Log error message"""
-    print(f"[{_format_timestamp()}] [error] {message}")
+    _log.error(message, *args)
 
 
-def warn(message: str):
+def warn(message: str, *args):
     """Log warning message"""
-    print(f"[{_format_timestamp()}] [warn] {message}")
+    _log.warning(message, *args)
 
 
-def warning(message: str):
+def warning(message: str, *args):
     """Log warning message (alias for warn)"""
-    warn(message)
+    _log.warning(message, *args)
 
 
-def debug(message: str):
+def debug(message: str, *args):
     """Log debug message (only if verbose enabled)"""
-    if _verbose_enabled:
-        print(f"[{_format_timestamp()}] [debug] {message}")
+    _log.debug(message, *args)
 
 
 def phase(message: str):
     """Log phase separator"""
-    print()
-    print(f"[{_format_timestamp()}] [info] === {message} ===")
+    _handler.stream.write("\n")
+    _log.info("=== %s ===", message)
@@ -2,13 +2,14 @@
 
 from .error_handler import ErrorHandler
 from .performance_monitor import PerformanceMonitor
-from .stream_id_generator import StreamIdGenerator, generate_stream_id
+from .stream_id_generator import StreamIdGenerator, default_generator, generate_stream_id
 from .verification_module import VerificationModule, verify
 
 __all__ = [
     'ErrorHandler',
     'PerformanceMonitor',
     'StreamIdGenerator',
+    'default_generator',
     'generate_stream_id',
     'VerificationModule',
     'verify',
@@ -5,7 +5,7 @@ Matches the Java ErrorHandler interface.
 
 import time
 from enum import Enum
-from typing import Optional, Dict, Callable
+from typing import Optional, List, Callable
 from .. import logger
 
 
@@ -18,6 +18,13 @@ class ErrorType(Enum):
     VALIDATION_ERROR = "VALIDATION_ERROR"
 
 
+# Position of each error type in ErrorHandler's count list
+_TYPE_INDEX = {error_type: index for index, error_type in enumerate(ErrorType)}
+
+# String form of each error type, resolved once instead of per report
+_ERROR_TYPE_STR = {error_type: error_type.value for error_type in ErrorType}
+
+
 class ErrorInfo:
     """Error information class."""
 
@@ -30,7 +37,7 @@ class ErrorInfo:
         self.recoverable = recoverable
 
     def __str__(self):
-        return f"ErrorInfo{{type={self.type.value}, message='{self.message}', " \
+        return f"ErrorInfo{{type={_ERROR_TYPE_STR[self.type]}, message='{self.message}', " \
             f"context='{self.context}', recoverable={self.recoverable}}}"
 
 
@@ -41,13 +48,10 @@ class ErrorHandler:
     """
 
     def __init__(self):
-        self._error_counts: Dict[ErrorType, int] = {}
+        # Error counts indexed by _TYPE_INDEX
+        self._error_counts: List[int] = [0] * len(ErrorType)
         self._on_error_callback: Optional[Callable[[ErrorInfo], None]] = None
 
-        # Initialize error counts for all error types
-        for error_type in ErrorType:
-            self._error_counts[error_type] = 0
-
     def report_error(self, error_type: ErrorType, message: str, context: str = "",
                      recoverable: bool = False):
         """Report an error.
@@ -183,7 +187,7 @@ class ErrorHandler:
         Returns:
             Error count
         """
-        return self._error_counts.get(error_type, 0)
+        return self._error_counts[_TYPE_INDEX[error_type]]
 
     def get_total_error_count(self) -> int:
         """Get total error count across all types.
@@ -191,12 +195,11 @@ class ErrorHandler:
         Returns:
             Total error count
         """
-        return sum(self._error_counts.values())
+        return sum(self._error_counts)
 
     def clear_error_counts(self):
         """Clear all error counts."""
-        for error_type in ErrorType:
-            self._error_counts[error_type] = 0
+        self._error_counts = [0] * len(ErrorType)
         logger.debug("Cleared all error counts")
 
     def _increment_error_count(self, error_type: ErrorType):
@@ -205,8 +208,7 @@ class ErrorHandler:
         Args:
             error_type: Error type
         """
-        self._error_counts[error_type] = self._error_counts.get(
-            error_type, 0) + 1
+        self._error_counts[_TYPE_INDEX[error_type]] += 1
 
     def _error_type_to_string(self, error_type: ErrorType) -> str:
         """Convert error type to string.
@@ -217,4 +219,4 @@ class ErrorHandler:
         Returns:
             String representation
         """
-        return error_type.value
+        return _ERROR_TYPE_STR[error_type]
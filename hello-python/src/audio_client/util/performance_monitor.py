@@ -9,6 +9,7 @@ class PerformanceMonitor:
     
     def __init__(self, file_size: int):
         self.file_size = file_size
+        self._file_size_mbits = (file_size * 8) / (1024 * 1024)  # Bytes to megabits
         self.upload_start_time = 0.0
         self.upload_end_time = 0.0
         self.download_start_time = 0.0
@@ -37,10 +38,10 @@ class PerformanceMonitor:
         total_duration_ms = upload_duration_ms + download_duration_ms
         
         # Calculate throughput in Mbps
-        file_size_mb = (self.file_size * 8) / (1024 * 1024)  # Convert bytes to megabits
-        upload_throughput_mbps = (file_size_mb / upload_duration_ms) * 1000 if upload_duration_ms > 0 else 0
-        download_throughput_mbps = (file_size_mb / download_duration_ms) * 1000 if download_duration_ms > 0 else 0
-        average_throughput_mbps = (file_size_mb * 2 / total_duration_ms) * 1000 if total_duration_ms > 0 else 0
+        file_size_mbits = self._file_size_mbits
+        upload_throughput_mbps = file_size_mbits * 1000 / upload_duration_ms if upload_duration_ms else 0.0
+        download_throughput_mbps = file_size_mbits * 1000 / download_duration_ms if download_duration_ms else 0.0
+        average_throughput_mbps = file_size_mbits * 2000 / total_duration_ms if total_duration_ms else 0.0
         
         return {
             'upload_duration_ms': upload_duration_ms,
@@ -1,5 +1,6 @@
 """Stream ID generator for creating unique stream identifiers."""
 
+import os
 import uuid
 import re
 from typing import Optional
@@ -11,6 +12,8 @@ class StreamIdGenerator:
     Matches the Java StreamIdGenerator interface.
     """
     
+    _short_pattern = re.compile(r'^[a-zA-Z0-9_-]+-[a-f0-9]{8}$')
+    
     def __init__(self):
         self.default_prefix = "stream"
         self.stream_id_pattern = re.compile(r'^[a-zA-Z0-9_-]+-[a-f0-9]{8}(-[a-f0-9]{4}){3}-[a-f0-9]{12}$')
@@ -58,9 +61,9 @@ class StreamIdGenerator:
         if not prefix:
             prefix = self.default_prefix
         
-        short_uuid = str(uuid.uuid4()).replace('-', '')[:8]
-        stream_id = f"{prefix}-{short_uuid}"
-        return stream_id
+        # 8 random hex characters, same alphabet as a truncated uuid4
+        short_uuid = os.urandom(4).hex()
+        return f"{prefix}-{short_uuid}"
     
     def validate(self, stream_id: str) -> bool:
         """Validate a stream ID format.
@@ -92,10 +95,7 @@ class StreamIdGenerator:
             return False
         
         # Check if it matches the short pattern: prefix-8chars
-        short_pattern = re.compile(r'^[a-zA-Z0-9_-]+-[a-f0-9]{8}$')
-        is_valid = bool(short_pattern.match(stream_id))
-        
-        return is_valid
+        return bool(self._short_pattern.match(stream_id))
     
     def extract_prefix(self, stream_id: str) -> Optional[str]:
         """Extract the prefix from a stream ID.
@@ -109,9 +109,9 @@ class StreamIdGenerator:
         if not stream_id:
             return None
         
-        dash_index = stream_id.find('-')
-        if dash_index > 0:
-            return stream_id[:dash_index]
+        prefix, separator, _ = stream_id.partition('-')
+        if separator and prefix:
+            return prefix
         
         return None
     
@@ -127,13 +127,26 @@ class StreamIdGenerator:
         if not stream_id:
             return None
         
-        dash_index = stream_id.find('-')
-        if dash_index > 0 and dash_index < len(stream_id) - 1:
-            return stream_id[dash_index + 1:]
+        prefix, separator, uuid_part = stream_id.partition('-')
+        if separator and prefix and uuid_part:
+            return uuid_part
         
         return None
 
 
+# Shared generator for callers that don't supply their own (it holds no per-stream state)
+_DEFAULT_STREAM_ID_GEN = StreamIdGenerator()
+
+
+def default_generator() -> StreamIdGenerator:
+    """Return the shared StreamIdGenerator.
+    
+    Returns:
+        process-wide generator for callers that don't supply their own
+    """
+    return _DEFAULT_STREAM_ID_GEN
+
+
 # Convenience function for quick stream ID generation
 def generate_stream_id(prefix: str = "stream") -> str:
     """Generate a stream ID with optional prefix.
@@ -144,5 +157,4 @@ def generate_stream_id(prefix: str = "stream") -> str:
     Returns:
         stream ID in format "{prefix}-{uuid}"
     """
-    generator = StreamIdGenerator()
-    return generator.generate_with_prefix(prefix)
+    return _DEFAULT_STREAM_ID_GEN.generate_with_prefix(prefix)
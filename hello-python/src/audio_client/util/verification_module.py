@@ -1,31 +1,61 @@
 """File verification module for comparing original and downloaded files"""
 
-from typing import Dict, Any
+import asyncio
+from typing import Dict, Any, Optional, Tuple
 from .. import logger
 from ..core import file_manager
 
+# A precomputed checksum: (algorithm, hex digest)
+Checksum = Tuple[str, str]
 
-async def verify(original_path: str, downloaded_path: str) -> Dict[str, Any]:
-    """Verify file integrity"""
+
+async def verify(original_path: str, downloaded_path: str,
+                 original_checksum: Optional[Checksum] = None,
+                 downloaded_checksum: Optional[Checksum] = None,
+                 algorithm: str = "sha256") -> Dict[str, Any]:
+    """Verify file integrity.
+
+    Checksums computed during transfer can be passed in as (algorithm,
+    digest) pairs to skip re-reading the files. A checksum left as None,
+    or computed with a different algorithm, is calculated from disk using
+    the given algorithm ("sha256" or "blake3"), so both sides are always
+    compared with the same one. Missing checksums are calculated
+    concurrently in worker threads. Checksums are skipped (returned as
+    None) when the sizes already differ.
+    """
     logger.info(f"Original file: {original_path}")
     logger.info(f"Downloaded file: {downloaded_path}")
     
     # Get file sizes
-    original_size = await file_manager.get_file_size(original_path)
-    downloaded_size = await file_manager.get_file_size(downloaded_path)
+    original_size, downloaded_size = await asyncio.gather(
+        file_manager.get_file_size(original_path),
+        file_manager.get_file_size(downloaded_path))
     
     logger.info(f"Original size: {original_size} bytes")
     logger.info(f"Downloaded size: {downloaded_size} bytes")
     
-    # Calculate checksums
-    original_checksum = await file_manager.calculate_checksum(original_path)
-    downloaded_checksum = await file_manager.calculate_checksum(downloaded_path)
+    # A size mismatch already decides the result; skip hashing both files
+    if original_size != downloaded_size:
+        logger.warn("File sizes differ, skipping checksum calculation")
+        return {
+            'passed': False,
+            'original_size': original_size,
+            'downloaded_size': downloaded_size,
+            'original_checksum': None,
+            'downloaded_checksum': None
+        }
+    
+    # Calculate missing checksums in parallel worker threads
+    original_checksum, downloaded_checksum = await asyncio.gather(
+        _resolve_checksum(original_path, original_checksum, algorithm),
+        _resolve_checksum(downloaded_path, downloaded_checksum, algorithm))
     
-    logger.info(f"Original checksum (SHA-256): {original_checksum}")
-    logger.info(f"Downloaded checksum (SHA-256): {downloaded_checksum}")
+    algorithm_name = algorithm.upper().replace("SHA", "SHA-")
+    logger.info(f"Original checksum ({algorithm_name}): {original_checksum}")
+    logger.info(f"Downloaded checksum ({algorithm_name}): {downloaded_checksum}")
     
     # Compare
-    passed = original_size == downloaded_size and original_checksum == downloaded_checksum
+    passed = original_checksum == downloaded_checksum
     
     return {
         'passed': passed,
@@ -36,10 +66,21 @@ async def verify(original_path: str, downloaded_path: str) -> Dict[str, Any]:
     }
 
 
+async def _resolve_checksum(file_path: str, checksum: Optional[Checksum], algorithm: str) -> str:
+    """Return the known checksum if it uses algorithm, or calculate it from disk"""
+    if checksum is not None and checksum[0] == algorithm:
+        return checksum[1]
+    return await file_manager.calculate_checksum(file_path, algorithm)
+
+
 class VerificationModule:
     """Module for file verification operations"""
     
     @staticmethod
-    async def verify_files(original_path: str, downloaded_path: str) -> Dict[str, Any]:
+    async def verify_files(original_path: str, downloaded_path: str,
+                           original_checksum: Optional[Checksum] = None,
+                           downloaded_checksum: Optional[Checksum] = None,
+                           algorithm: str = "sha256") -> Dict[str, Any]:
         """Verify file integrity"""
-        return await verify(original_path, downloaded_path)
+        return await verify(original_path, downloaded_path,
+                            original_checksum, downloaded_checksum, algorithm)
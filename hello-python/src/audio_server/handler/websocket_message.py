@@ -2,11 +2,43 @@
 WebSocket message data classes for JSON serialization/deserialization.
 """
 
-from dataclasses import dataclass, asdict
-from typing import Optional
+from dataclasses import dataclass
+from typing import List, Optional
 import json
+import threading
 from enum import Enum
 
+try:
+    import orjson
+except ImportError:  # optional accelerated JSON codec
+    orjson = None
+
+
+def _dumps(data: dict) -> str:
+    """Encode a dict as a JSON string, using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(data).decode()
+    return json.dumps(data)
+
+
+def _loads(json_str):
+    """Decode a JSON string, using orjson when installed.
+
+    orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers
+    catch the same exception either way.
+    """
+    if orjson is not None:
+        return orjson.loads(json_str)
+    return json.loads(json_str)
+
+
+# Parsed messages kept for reuse by WebSocketMessage.acquire()
+MESSAGE_POOL_SIZE = 128
+
+# Prebuilt STARTED/STOPPED replies; only the JSON-encoded streamId varies
+_STARTED_TEMPLATE = '{"type":"STARTED","streamId":%s,"message":"Stream started successfully"}'
+_STOPPED_TEMPLATE = '{"type":"STOPPED","streamId":%s,"message":"Stream finalized successfully"}'
+
 
 class MessageType(str, Enum):
     """
@@ -29,13 +61,19 @@ class MessageType(str, Enum):
         """
         if value is None:
             return None
-        try:
-            return cls[value.upper()]
-        except KeyError:
-            return None
+        # Protocol messages are uppercase, so the exact match almost always hits
+        msg_type = _STR2TYPE.get(value)
+        if msg_type is None:
+            msg_type = _STR2TYPE.get(value.upper())
+        return msg_type
 
 
-@dataclass
+# Lookup table for MessageType.from_string
+_STR2TYPE = {member.value: member for member in MessageType}
+_STR2TYPE.update({name.lower(): member for name, member in _STR2TYPE.items()})
+
+
+@dataclass(slots=True)
 class WebSocketMessage:
     """
     WebSocket control message for client-server communication.
@@ -46,32 +84,68 @@ class WebSocketMessage:
     offset: Optional[int] = None
     length: Optional[int] = None
     message: Optional[str] = None
+    totalSize: Optional[int] = None  # Optional on START: expected upload size
 
     def to_json(self) -> str:
         """Convert to JSON string, excluding None values."""
-        data = {k: v for k, v in asdict(self).items() if v is not None}
-        return json.dumps(data)
+        return _dumps(self.to_dict())
 
     def to_dict(self) -> dict:
         """Convert to dictionary, excluding None values."""
-        return {k: v for k, v in asdict(self).items() if v is not None}
+        # Built field by field; asdict() would deep-copy every value first
+        data = {"type": self.type}
+        if self.streamId is not None:
+            data["streamId"] = self.streamId
+        if self.offset is not None:
+            data["offset"] = self.offset
+        if self.length is not None:
+            data["length"] = self.length
+        if self.message is not None:
+            data["message"] = self.message
+        if self.totalSize is not None:
+            data["totalSize"] = self.totalSize
+        return data
+
+    @classmethod
+    def acquire(cls) -> 'WebSocketMessage':
+        """
+        Take a message from the free list, or allocate one if it is empty.
+        Hand it back with release() once it is no longer referenced.
+        """
+        with _POOL_LOCK:
+            if _POOL:
+                return _POOL.pop()
+        return cls(type="")
+
+    def release(self):
+        """Clear all fields and return this message to the free list."""
+        self.type = ""
+        self.streamId = None
+        self.offset = None
+        self.length = None
+        self.message = None
+        self.totalSize = None
+        with _POOL_LOCK:
+            if len(_POOL) < MESSAGE_POOL_SIZE:
+                _POOL.append(self)
 
     @classmethod
     def from_json(cls, json_str: str) -> 'WebSocketMessage':
         """Parse from JSON string."""
-        data = json.loads(json_str)
+        data = _loads(json_str)
         return cls.from_dict(data)
 
     @classmethod
     def from_dict(cls, data: dict) -> 'WebSocketMessage':
-        """Parse from dictionary."""
-        return cls(
-            type=data.get("type", ""),
-            streamId=data.get("streamId"),
-            offset=data.get("offset"),
-            length=data.get("length"),
-            message=data.get("message")
-        )
+        """Parse from dictionary into a pooled message (see acquire())."""
+        msg = cls.acquire()
+        msg.type = data.get("type", "")
+        msg.streamId = data.get("streamId")
+        msg.offset = data.get("offset")
+        msg.length = data.get("length")
+        msg.message = data.get("message")
+        msg.totalSize = data.get("totalSize")
+        return msg
 
     def get_message_type(self) -> Optional[MessageType]:
         """
@@ -89,7 +163,22 @@ class WebSocketMessage:
         """Create a STOPPED response message."""
         return cls(type="STOPPED", streamId=stream_id, message=message)
 
+    @staticmethod
+    def started_json(stream_id: str) -> str:
+        """Build the default STARTED response JSON without a dataclass round trip."""
+        return _STARTED_TEMPLATE % json.dumps(stream_id)
+
+    @staticmethod
+    def stopped_json(stream_id: str) -> str:
+        """Build the default STOPPED response JSON without a dataclass round trip."""
+        return _STOPPED_TEMPLATE % json.dumps(stream_id)
+
     @classmethod
     def error(cls, message: str) -> 'WebSocketMessage':
         """Create an ERROR response message."""
         return cls(type="ERROR", message=message)
+
+
+# Free list shared by WebSocketMessage.acquire() and release()
+_POOL: List[WebSocketMessage] = []
+_POOL_LOCK = threading.Lock()
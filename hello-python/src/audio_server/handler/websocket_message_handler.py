@@ -3,13 +3,38 @@ WebSocket message handler for processing incoming messages.
 Handles message routing and business logic.
 """
 
+import asyncio
 import json
+from dataclasses import dataclass
+from typing import Dict, Optional, Union
 from websockets.asyncio.server import ServerConnection
 from loguru import logger
 
 from audio_server.memory.stream_manager import StreamManager
+from audio_server.memory.memory_mapped_cache import MAX_CACHE_SIZE
+from audio_server.memory.memory_pool_manager import MemoryPoolManager
 from audio_server.handler.websocket_message import WebSocketMessage, MessageType
 
+# Replies queued per connection before handlers wait for the writer
+OUTBOX_SIZE = 64
+# Longest time a small binary frame waits to be coalesced, in seconds
+COALESCE_DELAY = 0.001
+# Frames at least this large are written from a worker thread
+OFFLOAD_SIZE = 256 * 1024
+
+
+@dataclass(slots=True)
+class ConnState:
+    """
+    Per-connection state kept by the message handler.
+    """
+    stream_id: Optional[str] = None
+    outbox: Optional[asyncio.Queue] = None
+    writer: Optional[asyncio.Task] = None
+    pending: Optional[bytearray] = None  # Pooled buffer of small frames not yet written
+    pending_len: int = 0
+    flush_handle: Optional[asyncio.TimerHandle] = None
+
 
 class WebSocketMessageHandler:
     """
@@ -17,14 +42,51 @@ class WebSocketMessageHandler:
     Routes messages to appropriate stream operations.
     """
 
-    def __init__(self, stream_manager: StreamManager):
+    def __init__(self, stream_manager: StreamManager,
+                 memory_pool: Optional[MemoryPoolManager] = None):
         """
         Initialize message handler.
 
         Args:
             stream_manager: StreamManager instance for stream operations
+            memory_pool: Pool providing the buffers small frames are coalesced in
         """
         self.stream_manager = stream_manager
+        self.memory_pool = memory_pool or MemoryPoolManager.get_instance()
+        self._conns: Dict[ServerConnection, ConnState] = {}
+
+    def open_connection(self, websocket: ServerConnection):
+        """
+        Start the outbound writer task for a new connection.
+
+        Replies are queued and sent by this single task, so they keep their
+        order while the connection's receive loop moves on to the next message.
+
+        Args:
+            websocket: WebSocket connection
+        """
+        outbox: asyncio.Queue = asyncio.Queue(maxsize=OUTBOX_SIZE)
+        writer = asyncio.create_task(self._drain_outbox(websocket, outbox))
+        self._conns[websocket] = ConnState(outbox=outbox, writer=writer)
+
+    async def close_connection(self, websocket: ServerConnection):
+        """
+        Flush queued replies and stop the writer task of a connection.
+
+        Args:
+            websocket: WebSocket connection
+        """
+        state = self._conns.pop(websocket, None)
+        if state is None:
+            return
+        if not self._flush_pending(state):
+            logger.error(f"Failed to write buffered data to stream {state.stream_id}")
+        if state.pending is not None:
+            self.memory_pool.release_buffer(state.pending)
+            state.pending = None
+        if state.writer is not None:
+            await state.outbox.put(None)
+            await state.writer
 
     async def handle_message(self, websocket: ServerConnection, message):
         """
@@ -56,6 +118,12 @@ class WebSocketMessageHandler:
         """
         try:
             msg = WebSocketMessage.from_json(message)
+        except json.JSONDecodeError as e:
+            logger.error(f"Invalid JSON message: {e}")
+            await self.send_error(websocket, "Invalid JSON format")
+            return
+
+        try:
             msg_type = msg.get_message_type()
 
             if msg_type is None:
@@ -72,10 +140,9 @@ class WebSocketMessageHandler:
             else:
                 logger.warning(f"Unhandled message type: {msg_type}")
                 await self.send_error(websocket, f"Unhandled message type: {msg_type}")
-
-        except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON message: {e}")
-            await self.send_error(websocket, "Invalid JSON format")
+        finally:
+            # Handlers do not keep the message, so it can be reused
+            msg.release()
 
     async def handle_binary_message(self, websocket: ServerConnection, data: bytes):
         """
@@ -85,21 +152,44 @@ class WebSocketMessageHandler:
             websocket: WebSocket connection
             data: Binary audio data
         """
-        logger.debug(f"Received {len(data)} bytes of binary data")
+        # Per-frame logs pass args so loguru skips formatting below DEBUG
+        logger.debug("Received {} bytes of binary data", len(data))
 
         # Get the current stream ID for this connection
-        # We need to track which stream is associated with this websocket
-        if not hasattr(websocket, 'current_stream_id'):
+        state = self._conns.get(websocket)
+        stream_id = state.stream_id if state is not None else None
+        if stream_id is None:
             logger.error("Received binary data without active stream")
             await self.send_error(websocket, "No active stream for binary data")
             return
 
-        stream_id = websocket.current_stream_id  # type: ignore[attr-defined]
+        size = len(data)
+        if size < self.memory_pool.buffer_size:
+            # Small frame: collect it and write several in one go
+            if state.pending is None:
+                state.pending = self.memory_pool.acquire_buffer()
+            if state.pending_len + size > len(state.pending) and not self._flush_pending(state):
+                await self.send_error(websocket, f"Failed to write data to stream: {stream_id}")
+                return
+            end = state.pending_len + size
+            state.pending[state.pending_len:end] = data
+            state.pending_len = end
+            if state.flush_handle is None:
+                state.flush_handle = asyncio.get_running_loop().call_later(
+                    COALESCE_DELAY, self._on_flush_timer, websocket)
+            return
 
-        # Write data to stream
-        if not self.stream_manager.write_chunk(stream_id, data):
+        # Write data to stream, after anything buffered ahead of it; the
+        # receive loop waits here, so frames stay in order
+        if not self._flush_pending(state):
+            written = False
+        elif size >= OFFLOAD_SIZE:
+            written = await self.stream_manager.write_chunk_async(stream_id, data)
+        else:
+            written = self.stream_manager.write_chunk(stream_id, data)
+        if not written:
             logger.error(
-                f"Failed to write {len(data)} bytes to stream {stream_id}")
+                f"Failed to write {size} bytes to stream {stream_id}")
             await self.send_error(websocket, f"Failed to write data to stream: {stream_id}")
 
     async def handle_start(self, websocket: ServerConnection, msg: WebSocketMessage):
@@ -115,14 +205,27 @@ class WebSocketMessageHandler:
             await self.send_error(websocket, "Missing streamId")
             return
 
+        # Clients that announce the upload size get the cache file preallocated
+        expected_size = msg.totalSize if msg.totalSize is not None else 0
+        if (not isinstance(expected_size, int) or isinstance(expected_size, bool)
+                or not 0 <= expected_size <= MAX_CACHE_SIZE):
+            await self.send_error(websocket, f"Invalid totalSize: {msg.totalSize}")
+            return
+
+        # Buffered frames belong to the previous stream
+        state = self._conns.get(websocket)
+        if state is not None and not self._flush_pending(state):
+            logger.error(f"Failed to write buffered data to stream {state.stream_id}")
+
         # Create stream
-        if self.stream_manager.create_stream(stream_id):
+        if self.stream_manager.create_stream(stream_id, expected_size):
             # Associate this stream with the websocket connection
-            # type: ignore[attr-defined]
-            websocket.current_stream_id = stream_id
+            if state is None:
+                # Connection without open_connection(): track it from here on
+                state = self._conns[websocket] = ConnState()
+            state.stream_id = stream_id
 
-            response = WebSocketMessage.started(stream_id)
-            await websocket.send(response.to_json())
+            await self._send(websocket, WebSocketMessage.started_json(stream_id))
             logger.info(f"Stream started: {stream_id}")
         else:
             await self.send_error(websocket, f"Failed to create stream: {stream_id}")
@@ -140,10 +243,15 @@ class WebSocketMessageHandler:
             await self.send_error(websocket, "Missing streamId")
             return
 
+        # Write out buffered frames before the stream is sealed
+        state = self._conns.get(websocket)
+        if state is not None and not self._flush_pending(state):
+            await self.send_error(websocket, f"Failed to write data to stream: {state.stream_id}")
+            return
+
         # Finalize stream
-        if self.stream_manager.finalize_stream(stream_id):
-            response = WebSocketMessage.stopped(stream_id)
-            await websocket.send(response.to_json())
+        if await self.stream_manager.finalize_stream_async(stream_id):
+            await self._send(websocket, WebSocketMessage.stopped_json(stream_id))
             logger.info(f"Stream finalized: {stream_id}")
         else:
             await self.send_error(websocket, f"Failed to finalize stream: {stream_id}")
@@ -164,14 +272,18 @@ class WebSocketMessageHandler:
             await self.send_error(websocket, "Missing streamId")
             return
 
+        # Make frames still being coalesced readable
+        state = self._conns.get(websocket)
+        if state is not None and not self._flush_pending(state):
+            logger.error(f"Failed to write buffered data to stream {state.stream_id}")
+
         # Read data from stream
         chunk_data = self.stream_manager.read_chunk(stream_id, offset, length)
 
         if chunk_data:
-            # Send binary data
-            await websocket.send(chunk_data)
             logger.debug(
-                f"Sent {len(chunk_data)} bytes for stream {stream_id} at offset {offset}")
+                "Queued {} bytes for stream {} at offset {}", len(chunk_data), stream_id, offset)
+            await self._send(websocket, chunk_data)
         else:
             await self.send_error(websocket, f"Failed to read from stream: {stream_id}")
 
@@ -184,5 +296,79 @@ class WebSocketMessageHandler:
             message: Error message
         """
         response = WebSocketMessage.error(message)
-        await websocket.send(response.to_json())
+        await self._send(websocket, response.to_json())
         logger.error(f"Sent error to client: {message}")
+
+    def _flush_pending(self, state: ConnState) -> bool:
+        """
+        Write coalesced small frames to the connection's stream.
+
+        Args:
+            state: Connection state holding the buffered frames
+
+        Returns:
+            True if nothing was buffered or the write succeeded
+        """
+        if state.flush_handle is not None:
+            state.flush_handle.cancel()
+            state.flush_handle = None
+        if not state.pending_len:
+            return True
+        data = memoryview(state.pending)[:state.pending_len]
+        state.pending_len = 0
+        try:
+            return self.stream_manager.write_chunk(state.stream_id, data)
+        finally:
+            data.release()
+
+    def _on_flush_timer(self, websocket: ServerConnection):
+        """
+        Flush small frames that have waited COALESCE_DELAY.
+
+        Args:
+            websocket: WebSocket connection
+        """
+        state = self._conns.get(websocket)
+        if state is None:
+            return
+        state.flush_handle = None
+        if not self._flush_pending(state):
+            logger.error(f"Failed to write buffered data to stream {state.stream_id}")
+            asyncio.ensure_future(self.send_error(
+                websocket, f"Failed to write data to stream: {state.stream_id}"))
+
+    async def _send(self, websocket: ServerConnection, payload: Union[str, bytes]):
+        """
+        Queue a reply for the connection's writer task.
+
+        Args:
+            websocket: WebSocket connection
+            payload: Text or binary reply
+        """
+        state = self._conns.get(websocket)
+        if state is not None and state.outbox is not None:
+            await state.outbox.put(payload)
+            return
+        # Connection without a writer task: send inline
+        await websocket.send(payload)
+
+    async def _drain_outbox(self, websocket: ServerConnection, outbox: asyncio.Queue):
+        """
+        Send queued replies in order until the close sentinel arrives.
+
+        Args:
+            websocket: WebSocket connection
+            outbox: Queue of replies, terminated by None
+        """
+        while True:
+            batch = [await outbox.get()]
+            while not outbox.empty():
+                batch.append(outbox.get_nowait())
+            for payload in batch:
+                if payload is None:
+                    return
+                try:
+                    await websocket.send(payload)
+                except Exception as e:
+                    # Keep draining so close_connection() is not left waiting
+                    logger.debug("Dropped reply for closed connection: {}", e)
@@ -10,6 +10,7 @@ from loguru import logger
 import sys
 
 from .network.audio_websocket_server import AudioWebSocketServer
+from .network.event_loop import install_event_loop
 from .memory import StreamManager, MemoryPoolManager
 
 
@@ -67,5 +68,11 @@ async def main():
         logger.info("Server stopped")
 
 
-if __name__ == "__main__":
+def run():
+    """Synchronous entry point: run the server on uvloop when available"""
+    install_event_loop()
     asyncio.run(main())
+
+
+if __name__ == "__main__":
+    run()
@@ -3,7 +3,7 @@
 import mmap
 import os
 import threading
-from typing import Optional, IO
+from typing import Optional, IO, Union
 from loguru import logger
 
 # Configuration constants - follows unified mmap specification v2.0.0
@@ -11,21 +11,52 @@ DEFAULT_PAGE_SIZE = 64 * 1024 * 1024  # 64MB
 MAX_CACHE_SIZE = 8 * 1024 * 1024 * 1024  # 8GB
 SEGMENT_SIZE = 1 * 1024 * 1024 * 1024  # 1GB per segment
 BATCH_OPERATION_LIMIT = 1000  # Max batch operations
+MIN_GROWTH_SIZE = 16 * 1024 * 1024  # Smallest step when a write grows the file
+ALLOC_ALIGNMENT = 2 * 1024 * 1024  # File capacity is kept a multiple of this (huge page size)
+
+# Bytes-like payloads accepted by the write paths without conversion
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+def _round_up(size: int) -> int:
+    """Round size up to a multiple of ALLOC_ALIGNMENT."""
+    return -(-size // ALLOC_ALIGNMENT) * ALLOC_ALIGNMENT
 
 
 class MemoryMappedCache:
     """
     Memory-mapped cache implementation for efficient file operations.
-    Thread-safe with RLock for concurrent access.
+    Thread-safe with RLock for concurrent access; in-bounds writes take a
+    separate plain lock that only remapping contends on. Concurrent writes
+    to overlapping ranges are undefined, as with any shared mapping.
+
+    The file grows geometrically: capacity is the mapped length, size is
+    the logical end of the written data, and the file is trimmed back to
+    size on finalize.
     """
 
-    def __init__(self, path: str):
+    # Fixed attribute layout: no per-instance __dict__ on the write path
+    __slots__ = ("path", "initial_size", "file", "mmap", "_mv", "size", "capacity",
+                 "is_open", "_lock", "_write_lock", "_released")
+
+    def __init__(self, path: Union[str, os.PathLike], initial_size: int = 0):
+        """
+        Args:
+            path: Cache file path (str or Path)
+            initial_size: Bytes to preallocate when the file is first
+                created, e.g. the expected stream length (0 if unknown)
+        """
         self.path = path
+        self.initial_size = initial_size
         self.file: Optional[IO[bytes]] = None
         self.mmap: Optional[mmap.mmap] = None
-        self.size = 0
+        self._mv: Optional[memoryview] = None  # Cached view of self.mmap
+        self.size = 0  # Logical length
+        self.capacity = 0  # Mapped file length, >= size
         self.is_open = False
         self._lock = threading.RLock()  # Reentrant lock for thread safety
+        self._write_lock = threading.Lock()  # Guards the mapping against remaps during fast writes
+        self._released = 0  # Mapped bytes already handed back with MADV_DONTNEED
 
     def create(self, path: str, initial_size: int = 0) -> bool:
         with self._lock:
@@ -33,7 +64,7 @@ class MemoryMappedCache:
 
     def _create_internal(self, path: str, initial_size: int = 0) -> bool:
         logger.debug(
-            f"Creating mmap file: {path} with initial size: {initial_size}")
+            "Creating mmap file: {} with initial size: {}", path, initial_size)
 
         try:
             # Ensure parent directory exists
@@ -41,23 +72,21 @@ class MemoryMappedCache:
             if parent_dir:
                 os.makedirs(parent_dir, exist_ok=True)
 
-            if os.path.exists(path):
-                os.remove(path)
-
-            # Create new file with w+b mode (write + binary, creates if not exists)
-            self.file = open(path, 'w+b')
+            # Create or truncate the file in a single open call
+            fd = os.open(path, os.O_CREAT | os.O_RDWR | os.O_TRUNC, 0o644)
+            self.file = os.fdopen(fd, 'r+b')
+            # initial_size reserves capacity; nothing has been written yet
             if initial_size > 0:
-                self.file.truncate(initial_size)
-                self.size = initial_size
-            else:
-                self.size = 0
+                self._preallocate(initial_size)
+            self.capacity = initial_size
+            self.size = 0
 
-            if self.size > 0:
+            if self.capacity > 0:
                 self.map_file()
 
             self.is_open = True
             logger.debug(
-                f"Created mmap file: {path} with size: {initial_size}")
+                "Created mmap file: {} with size: {}", path, initial_size)
             return True
 
         except Exception as e:
@@ -69,21 +98,21 @@ class MemoryMappedCache:
             return self._open_internal(path)
 
     def _open_internal(self, path: str) -> bool:
-        logger.debug(f"Opening mmap file: {path}")
+        logger.debug("Opening mmap file: {}", path)
 
         try:
-            if not os.path.exists(path):
+            try:
+                self.file = open(path, 'r+b')
+            except FileNotFoundError:
                 logger.error(f"File does not exist: {path}")
                 return False
+            self.size = self.capacity = os.fstat(self.file.fileno()).st_size
 
-            self.file = open(path, 'r+b')
-            self.size = os.path.getsize(path)
-
-            if self.size > 0:
+            if self.capacity > 0:
                 self.map_file()
 
             self.is_open = True
-            logger.debug(f"Opened mmap file: {path} with size: {self.size}")
+            logger.debug("Opened mmap file: {} with size: {}", path, self.size)
             return True
 
         except Exception as e:
@@ -94,40 +123,106 @@ class MemoryMappedCache:
         with self._lock:
             if self.is_open:
                 self.unmap_file()
-                logger.debug(f"Closed mmap file: {self.path}")
+                logger.debug("Closed mmap file: {}", self.path)
+
+    def write(self, offset: int, data: Buffer) -> int:
+        """
+        Copy data into the mapping at offset, growing the file if needed.
+        Any bytes-like object is copied straight in, without a bytes() copy.
+        """
+        length = len(data)
+        end = offset + length
+        # Fast path: writes inside the current mapping skip the RLock
+        with self._write_lock:
+            mv = self._mv
+            if mv is not None and end <= self.capacity:
+                mv[offset:end] = data
+                if end > self.size:
+                    self.size = end
+                if offset - self._released >= ALLOC_ALIGNMENT:
+                    self._release_written(offset)
+                return length
 
-    def write(self, offset: int, data: bytes) -> int:
         with self._lock:
             try:
-                if not self.is_open or self.mmap is None:
-                    initial_size = offset + len(data)
-                    if not self._create_internal(self.path, initial_size):
-                        return 0
-
-                required_size = offset + len(data)
-                if required_size > self.size:
-                    if not self._resize_internal(required_size):
-                        logger.error(
-                            "Failed to resize file for write operation")
-                        return 0
+                if not self._reserve_internal(end):
+                    return 0
 
-                assert self.mmap is not None
-                self.mmap[offset:offset + len(data)] = data
+                assert self._mv is not None
+                self._mv[offset:end] = data
+                if end > self.size:
+                    self.size = end
 
                 logger.debug(
-                    f"Wrote {len(data)} bytes to {self.path} at offset {offset}")
-                return len(data)
+                    "Wrote {} bytes to {} at offset {}", length, self.path, offset)
+                return length
 
             except Exception as e:
                 logger.error(f"Error writing to mapped file {self.path}: {e}")
                 return 0
 
+    def pwrite(self, offset: int, data: Buffer) -> int:
+        """
+        Write through the file descriptor instead of the mapping.
+
+        os.pwrite releases the GIL for the copy, so when this runs in a
+        worker thread the event loop keeps running; write() copies into
+        the mapping with the GIL held. The shared mapping sees the data
+        through the page cache.
+        """
+        length = len(data)
+        end = offset + length
+        with self._lock:
+            try:
+                if not self._reserve_internal(end):
+                    return 0
+            except Exception as e:
+                logger.error(f"Error writing to mapped file {self.path}: {e}")
+                return 0
+
+        # _write_lock keeps the descriptor open and the file from being resized
+        with self._write_lock:
+            try:
+                assert self.file is not None
+                fd = self.file.fileno()
+                view = memoryview(data)
+                while view:
+                    view = view[os.pwrite(fd, view, end - len(view)):]
+                if end > self.size:
+                    self.size = end
+                return length
+            except Exception as e:
+                logger.error(f"Error writing to file {self.path}: {e}")
+                return 0
+
+    def _reserve_internal(self, end: int) -> bool:
+        """Open the file if needed and grow it so that end bytes fit."""
+        if not self.is_open or self.mmap is None:
+            if not self._create_internal(self.path, _round_up(max(end, self.initial_size))):
+                return False
+
+        if end > self.capacity:
+            # Grow geometrically so streaming writes remap O(log n) times
+            new_capacity = _round_up(max(end, self.capacity * 2, MIN_GROWTH_SIZE))
+            if not self._resize_internal(new_capacity):
+                logger.error(
+                    "Failed to resize file for write operation")
+                return False
+        return True
+
     def read(self, offset: int, length: int) -> bytes:
+        """
+        Return a copy of up to length bytes at offset.
+
+        A copy rather than a view of the mapping: an exported view would stop
+        the mapping from being resized or closed until it was released.
+        Returns empty bytes at end of file or on error.
+        """
         with self._lock:
             try:
                 if not self.is_open or self.mmap is None:
                     logger.debug(
-                        f"File not open, attempting to open for reading: {self.path}")
+                        "File not open, attempting to open for reading: {}", self.path)
                     if not self._open_internal(self.path):
                         logger.error(
                             f"Failed to open file for reading: {self.path}")
@@ -135,15 +230,14 @@ class MemoryMappedCache:
 
                 if offset >= self.size:
                     logger.debug(
-                        f"Read offset {offset} at or beyond file size {self.size} - end of file")
+                        "Read offset {} at or beyond file size {} - end of file", offset, self.size)
                     return b''
 
                 actual_length = min(length, self.size - offset)
-                assert self.mmap is not None
                 data = self.mmap[offset:offset + actual_length]
 
                 logger.debug(
-                    f"Read {actual_length} bytes from {self.path} at offset {offset}")
+                    "Read {} bytes from {} at offset {}", actual_length, self.path, offset)
                 return data
 
             except Exception as e:
@@ -155,7 +249,7 @@ class MemoryMappedCache:
         with self._lock:
             return self.size
 
-    def get_path(self) -> str:
+    def get_path(self) -> Union[str, os.PathLike]:
         return self.path
 
     def get_is_open(self) -> bool:
@@ -164,31 +258,38 @@ class MemoryMappedCache:
 
     def resize(self, new_size: int) -> bool:
         with self._lock:
-            return self._resize_internal(new_size)
+            if not self._resize_internal(new_size):
+                return False
+            self.size = new_size
+            return True
 
     def _resize_internal(self, new_size: int) -> bool:
+        """Set the file and mapping length (capacity); size is clamped to it."""
         try:
             if not self.is_open:
                 logger.error(f"File not open for resize: {self.path}")
                 return False
 
-            if new_size == self.size:
+            if new_size == self.capacity:
                 return True
 
-            # Unmap only, don't close the file
-            if self.mmap is not None:
-                self.mmap.close()
-                self.mmap = None
+            with self._write_lock:
+                # Unmap only, don't close the file
+                self._release_view()
+                if self.mmap is not None:
+                    self.mmap.close()
+                    self.mmap = None
 
-            assert self.file is not None
-            self.file.truncate(new_size)
-            self.size = new_size
+                assert self.file is not None
+                self.file.truncate(new_size)
+                self.capacity = new_size
+                self.size = min(self.size, new_size)
 
-            if self.size > 0:
-                self.map_file()
+                if self.capacity > 0:
+                    self.map_file()
 
             logger.debug(
-                f"Resized and remapped file {self.path} to {new_size} bytes")
+                "Resized and remapped file {} to {} bytes", self.path, new_size)
             return True
 
         except Exception as e:
@@ -206,13 +307,17 @@ class MemoryMappedCache:
                 if self.mmap is not None:
                     self.mmap.flush()
 
-                logger.debug(f"Flushed file: {self.path}")
+                logger.debug("Flushed file: {}", self.path)
                 return True
             except Exception as e:
                 logger.error(f"Error flushing file {self.path}: {e}")
                 return False
 
-    def finalize(self, final_size: int) -> bool:
+    def finalize(self, final_size: int, sync: bool = True) -> bool:
+        """
+        Trim the file to its final size and, unless sync is False, flush it.
+        Callers passing sync=False are expected to call sync() later.
+        """
         with self._lock:
             try:
                 if not self.is_open:
@@ -220,41 +325,126 @@ class MemoryMappedCache:
                         f"File not open for finalization: {self.path}")
                     return False
 
+                # Trim the preallocated tail
                 if not self._resize_internal(final_size):
                     logger.error(
                         f"Failed to resize file during finalization: {self.path}")
                     return False
+                self.size = final_size
 
-                if self.mmap is not None:
+                if sync and self.mmap is not None:
                     self.mmap.flush()
 
                 logger.debug(
-                    f"Finalized file: {self.path} with size: {final_size}")
+                    "Finalized file: {} with size: {}", self.path, final_size)
                 return True
 
             except Exception as e:
                 logger.error(f"Error finalizing file {self.path}: {e}")
                 return False
 
+    def sync(self) -> bool:
+        """
+        Write dirty pages back to disk with fsync.
+
+        Unlike flush(), no lock is held during the fsync, which runs on a
+        duplicate descriptor and releases the GIL, so it can run in a worker
+        thread while reads and writes continue.
+        """
+        try:
+            # The remap lock only keeps the descriptor valid while it is duplicated
+            with self._write_lock:
+                if self.file is None:
+                    return True
+                fd = os.dup(self.file.fileno())
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            return True
+        except OSError as e:
+            logger.error(f"Error syncing file {self.path}: {e}")
+            return False
+
     def map_file(self) -> None:
         if self.file is None:
             raise ValueError("File is not open")
 
         self.mmap = mmap.mmap(self.file.fileno(), 0)
+        self._mv = memoryview(self.mmap)
+        self._released = 0
+        if hasattr(mmap, 'MADV_SEQUENTIAL'):
+            # Streams are written and replayed front to back
+            self.mmap.madvise(mmap.MADV_SEQUENTIAL)
+        if hasattr(mmap, 'MADV_HUGEPAGE'):
+            # Honoured only where the filesystem supports huge pages
+            try:
+                self.mmap.madvise(mmap.MADV_HUGEPAGE)
+            except OSError:
+                pass
         logger.debug(
-            f"Successfully mapped file: {self.path} ({self.size} bytes)")
+            "Successfully mapped file: {} ({} bytes)", self.path, self.capacity)
+
+    def _release_written(self, offset: int) -> None:
+        """
+        Unmap the whole ALLOC_ALIGNMENT blocks before offset from this process.
+
+        The mapping is shared, so their data stays in the page cache and is
+        written back as usual; the pages are only faulted in again if read.
+        Keeps the resident set of a long upload to about one block.
+        """
+        end = offset - offset % ALLOC_ALIGNMENT
+        if hasattr(mmap, 'MADV_DONTNEED'):
+            try:
+                self.mmap.madvise(mmap.MADV_DONTNEED, self._released, end - self._released)
+            except OSError:
+                pass
+        self._released = end
+
+    def _preallocate(self, size: int) -> None:
+        """Reserve disk blocks for size bytes, falling back to a sparse extend."""
+        assert self.file is not None
+        if hasattr(os, 'posix_fallocate'):
+            try:
+                os.posix_fallocate(self.file.fileno(), 0, size)
+                return
+            except OSError:
+                pass  # Not supported by this filesystem
+        self.file.truncate(size)
 
     def unmap_file(self) -> None:
-        if self.mmap is not None:
-            self.mmap.close()
-            self.mmap = None
+        # The file is closed under _write_lock too, so sync() never dups a stale fd
+        with self._write_lock:
+            self._release_view()
+            if self.mmap is not None:
+                self.mmap.close()
+                self.mmap = None
 
-        if self.file is not None:
-            self.file.close()
-            self.file = None
+            if self.file is not None:
+                if self.capacity > self.size:
+                    # Not finalized: drop the unwritten tail so a reopen sees the real length
+                    try:
+                        self.file.truncate(self.size)
+                    except OSError as e:
+                        logger.warning(f"Could not trim {self.path}: {e}")
+                    self.capacity = self.size
+                if hasattr(os, 'posix_fadvise'):
+                    # Nothing reads the closed stream through this cache again
+                    try:
+                        os.posix_fadvise(self.file.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+                    except OSError:
+                        pass
+                self.file.close()
+                self.file = None
 
         self.is_open = False
 
+    def _release_view(self) -> None:
+        # The mapping cannot be closed while the view is exported
+        if self._mv is not None:
+            self._mv.release()
+            self._mv = None
+
     def __del__(self):
         self.close()
 
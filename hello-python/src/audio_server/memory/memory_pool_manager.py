@@ -4,16 +4,22 @@ Singleton pattern implementation for shared buffer pool.
 Matches C++ MemoryPoolManager and Java MemoryPoolManager.
 """
 
+import ctypes
 import threading
 from typing import Optional
 from collections import deque
 from loguru import logger
 
+# Buffers each thread keeps for itself before spilling to the shared pool
+LOCAL_CACHE_SIZE = 8
+
 
 class MemoryPoolManager:
     """
     Singleton memory pool manager for buffer reuse.
-    Thread-safe buffer allocation and release.
+    Thread-safe buffer allocation and release: each thread first serves
+    itself from a small lock-free cache and only takes the mutex to reach
+    the shared pool.
     """
     
     _instance: Optional['MemoryPoolManager'] = None
@@ -50,6 +56,7 @@ class MemoryPoolManager:
         self.available_buffers: deque[bytearray] = deque()
         self.total_buffers = 0
         self.mutex = threading.Lock()
+        self._local = threading.local()
         
         # Pre-allocate buffers
         for _ in range(pool_size):
@@ -82,46 +89,61 @@ class MemoryPoolManager:
         Returns:
             A buffer of size buffer_size
         """
+        local_buffers = self._local_buffers()
+        if local_buffers:
+            return local_buffers.pop()
+
         with self.mutex:
             if self.available_buffers:
                 buffer = self.available_buffers.popleft()
-                logger.debug(f"Acquired buffer from pool ({len(self.available_buffers)} remaining)")
+                logger.debug("Acquired buffer from pool ({} remaining)", len(self.available_buffers))
                 return buffer
             else:
                 # Pool exhausted, allocate new buffer
                 buffer = bytearray(self.buffer_size)
                 self.total_buffers += 1
-                logger.debug(f"Pool exhausted, allocated new buffer (total: {self.total_buffers})")
+                logger.debug("Pool exhausted, allocated new buffer (total: {})", self.total_buffers)
                 return buffer
     
-    def release_buffer(self, buffer: bytearray) -> None:
+    def release_buffer(self, buffer: bytearray, zero: bool = False) -> None:
         """
         Release a buffer back to the pool.
         
+        Pooled buffers are scratch space: an acquired buffer may hold bytes
+        from its previous user, so callers must write a full payload before
+        reading it back.
+        
         Args:
             buffer: The buffer to release
+            zero: Clear the buffer first (for callers that held sensitive data)
         """
         if len(buffer) != self.buffer_size:
             logger.warning(f"Buffer size mismatch: expected {self.buffer_size}, got {len(buffer)}")
             return
         
+        if zero:
+            # The caller still owns the buffer here, so only the append needs the lock
+            ctypes.memset(ctypes.addressof(ctypes.c_char.from_buffer(buffer)), 0, self.buffer_size)
+        
+        local_buffers = self._local_buffers()
+        if len(local_buffers) < LOCAL_CACHE_SIZE:
+            local_buffers.append(buffer)
+            return
+
         with self.mutex:
-            # Clear buffer before returning to pool
-            for i in range(len(buffer)):
-                buffer[i] = 0
-            
             self.available_buffers.append(buffer)
-            logger.debug(f"Released buffer to pool ({len(self.available_buffers)} available)")
+            logger.debug("Released buffer to pool ({} available)", len(self.available_buffers))
     
     def get_available_buffers(self) -> int:
         """
         Get the number of available buffers in the pool.
         
         Returns:
-            Number of available buffers
+            Number of available buffers (shared pool plus this thread's cache)
         """
+        local_count = len(self._local_buffers())
         with self.mutex:
-            return len(self.available_buffers)
+            return len(self.available_buffers) + local_count
     
     def get_total_buffers(self) -> int:
         """
@@ -132,3 +154,16 @@ class MemoryPoolManager:
         """
         with self.mutex:
             return self.total_buffers
+    
+    def _local_buffers(self) -> list:
+        """
+        Get the calling thread's buffer cache, creating it on first use.
+        
+        Returns:
+            List of buffers owned by the calling thread
+        """
+        try:
+            return self._local.buffers
+        except AttributeError:
+            self._local.buffers = []
+            return self._local.buffers
@@ -5,25 +5,27 @@ Matches C++ StreamContext structure and Java StreamContext class.
 """
 
 from dataclasses import dataclass, field
-from datetime import datetime
-from enum import Enum
-from typing import Optional
-import threading
+from enum import IntEnum
+from pathlib import Path
+from typing import Callable, Optional, Union
+import time
 from .memory_mapped_cache import MemoryMappedCache
 
 
-class StreamStatus(Enum):
+class StreamStatus(IntEnum):
     """Stream status enumeration"""
-    UPLOADING = "UPLOADING"
-    READY = "READY"
-    ERROR = "ERROR"
+    # Integer values: the per-chunk status check is a plain int comparison
+    UPLOADING = 0
+    READY = 1
+    ERROR = 2
 
 
 @dataclass
 class StreamContext:
     """
     Stream context containing metadata and state for a single stream.
-    Thread-safe with Lock for concurrent access.
+    Not locked: each stream has a single writer, the connection that
+    started it, and MemoryMappedCache guards the data itself.
     
     Attributes:
         stream_id: Unique identifier for the stream
@@ -31,21 +33,30 @@ class StreamContext:
         mmap_file: Memory-mapped cache instance
         current_offset: Current write position in bytes
         total_size: Total size of the stream in bytes
-        created_at: Timestamp when stream was created
-        last_accessed_at: Timestamp of last access
+        synced_size: total_size when the last checkpoint sync was queued
+            (only StreamManager.checkpoint_streams writes it)
+        created_at: time.monotonic() when stream was created
+        last_accessed_at: time.monotonic() of last access
         status: Current status of the stream
-        lock: Thread lock for concurrent access
     """
     stream_id: str
-    cache_path: str = ""
+    cache_path: Union[str, Path] = ""
     mmap_file: Optional[MemoryMappedCache] = None
     current_offset: int = 0
     total_size: int = 0
-    created_at: datetime = field(default_factory=datetime.now)
-    last_accessed_at: datetime = field(default_factory=datetime.now)
+    synced_size: int = 0
+    created_at: float = field(default_factory=time.monotonic)
+    last_accessed_at: float = field(default_factory=time.monotonic)
     status: StreamStatus = StreamStatus.UPLOADING
-    lock: threading.Lock = field(default_factory=threading.Lock)
+    # mmap_file.write bound once at construction for the chunk path
+    _write: Optional[Callable[[int, bytes], int]] = field(
+        default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.mmap_file is not None:
+            self._write = self.mmap_file.write
     
     def update_access_time(self) -> None:
         """Update the last accessed timestamp"""
-        self.last_accessed_at = datetime.now()
+        # Called per chunk: a float clock read instead of building a datetime
+        self.last_accessed_at = time.monotonic()
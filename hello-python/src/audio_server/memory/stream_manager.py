@@ -4,21 +4,28 @@ Thread-safe registry of stream contexts.
 Matches C++ StreamManager and Java StreamManager functionality.
 """
 
-import os
+import asyncio
 import threading
-from datetime import datetime, timedelta
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
 from pathlib import Path
 from loguru import logger
 
 from .stream_context import StreamContext, StreamStatus
-from .memory_mapped_cache import MemoryMappedCache
+from .memory_mapped_cache import Buffer, MemoryMappedCache
+
+# Independent registry shards; a power of two so a mask picks the shard
+SHARD_COUNT = 16
 
 
 class StreamManager:
     """
     Singleton stream manager for managing multiple concurrent streams.
-    Thread-safe stream creation, retrieval, and deletion.
+    Thread-safe stream creation, retrieval, and deletion: the registry is
+    split into shards by stream ID, each a copy-on-write dict with its own
+    lock, so lookups take no lock and only changes to the same shard
+    contend.
     """
 
     _instance: Optional['StreamManager'] = None
@@ -49,11 +56,15 @@ class StreamManager:
             return
 
         self.cache_directory = cache_directory
-        self.streams: Dict[str, StreamContext] = {}
-        self.mutex = threading.Lock()
+        self.cache_dir = Path(cache_directory)
+        # Shards are never mutated in place: writers swap in an updated copy
+        self.shards: List[Dict[str, StreamContext]] = [{} for _ in range(SHARD_COUNT)]
+        self.shard_locks = [threading.Lock() for _ in range(SHARD_COUNT)]
+        # Finalized streams are written back to disk here, off the event loop
+        self._sync_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stream-sync")
 
         # Create cache directory if it doesn't exist
-        Path(cache_directory).mkdir(parents=True, exist_ok=True)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
 
         self._initialized = True
         logger.info(
@@ -72,41 +83,57 @@ class StreamManager:
         """
         return cls(cache_directory)
 
-    def create_stream(self, stream_id: str) -> bool:
+    @property
+    def streams(self) -> Dict[str, StreamContext]:
+        """
+        Snapshot of all registered streams.
+
+        Returns:
+            New dict mapping stream ID to context
+        """
+        streams: Dict[str, StreamContext] = {}
+        for shard in self.shards:
+            streams.update(shard)
+        return streams
+
+    def create_stream(self, stream_id: str, expected_size: int = 0) -> bool:
         """
         Create a new stream.
 
         Args:
             stream_id: Unique identifier for the stream
+            expected_size: Expected stream length in bytes, preallocated on
+                the first write (0 if unknown)
 
         Returns:
             True if successful, False if stream already exists
         """
-        with self.mutex:
+        index = self._shard(stream_id)
+        with self.shard_locks[index]:
             # Check if stream already exists
-            if stream_id in self.streams:
+            if stream_id in self.shards[index]:
                 logger.warning(f"Stream already exists: {stream_id}")
                 return False
 
             try:
-                # Create new stream context
+                # Create memory-mapped cache file
                 cache_path = self._get_cache_path(stream_id)
+                mmap_file = MemoryMappedCache(cache_path, initial_size=expected_size)
+
+                # Create new stream context
                 context = StreamContext(
                     stream_id=stream_id,
                     cache_path=cache_path,
+                    mmap_file=mmap_file,
                     current_offset=0,
                     total_size=0,
-                    status=StreamStatus.UPLOADING,
-                    created_at=datetime.now(),
-                    last_accessed_at=datetime.now()
+                    status=StreamStatus.UPLOADING
                 )
 
-                # Create memory-mapped cache file
-                mmap_file = MemoryMappedCache(cache_path)
-                context.mmap_file = mmap_file
-
-                # Add to registry
-                self.streams[stream_id] = context
+                # Publish a new shard that includes the stream
+                shard = dict(self.shards[index])
+                shard[stream_id] = context
+                self.shards[index] = shard
 
                 logger.info(
                     f"Created stream: {stream_id} at path: {cache_path}")
@@ -126,11 +153,10 @@ class StreamManager:
         Returns:
             Stream context or None if not found
         """
-        with self.mutex:
-            context = self.streams.get(stream_id)
-            if context:
-                context.update_access_time()
-            return context
+        context = self.shards[self._shard(stream_id)].get(stream_id)
+        if context:
+            context.update_access_time()
+        return context
 
     def delete_stream(self, stream_id: str) -> bool:
         """
@@ -142,30 +168,45 @@ class StreamManager:
         Returns:
             True if successful
         """
-        with self.mutex:
-            context = self.streams.get(stream_id)
-            if not context:
-                logger.warning(f"Stream not found for deletion: {stream_id}")
-                return False
+        index = self._shard(stream_id)
+        with self.shard_locks[index]:
+            return self._delete_stream_locked(index, stream_id)
 
-            try:
-                # Close memory-mapped file
-                if context.mmap_file:
-                    context.mmap_file.close()
+    def _delete_stream_locked(self, index: int, stream_id: str) -> bool:
+        """
+        Delete a stream while its shard lock is held.
 
-                # Remove cache file
-                if os.path.exists(context.cache_path):
-                    os.remove(context.cache_path)
+        Args:
+            index: Shard holding the stream
+            stream_id: Unique identifier for the stream
 
-                # Remove from registry
-                del self.streams[stream_id]
+        Returns:
+            True if successful
+        """
+        context = self.shards[index].get(stream_id)
+        if not context:
+            logger.warning(f"Stream not found for deletion: {stream_id}")
+            return False
 
-                logger.info(f"Deleted stream: {stream_id}")
-                return True
+        try:
+            # Close memory-mapped file
+            if context.mmap_file:
+                context.mmap_file.close()
 
-            except Exception as e:
-                logger.error(f"Failed to delete stream {stream_id}: {e}")
-                return False
+            # Remove cache file
+            Path(context.cache_path).unlink(missing_ok=True)
+
+            # Publish a new shard without the stream
+            shard = dict(self.shards[index])
+            del shard[stream_id]
+            self.shards[index] = shard
+
+            logger.info(f"Deleted stream: {stream_id}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to delete stream {stream_id}: {e}")
+            return False
 
     def list_active_streams(self) -> List[str]:
         """
@@ -174,16 +215,17 @@ class StreamManager:
         Returns:
             List of stream IDs
         """
-        with self.mutex:
-            return list(self.streams.keys())
+        return [stream_id for shard in self.shards for stream_id in shard]
 
-    def write_chunk(self, stream_id: str, data: bytes) -> bool:
+    def write_chunk(self, stream_id: str, data: Buffer, through_fd: bool = False) -> bool:
         """
         Write a chunk of data to a stream.
 
         Args:
             stream_id: Unique identifier for the stream
-            data: Data to write
+            data: Data to write (bytes, bytearray or memoryview)
+            through_fd: Copy with pwrite instead of into the mapping (see
+                MemoryMappedCache.pwrite)
 
         Returns:
             True if successful
@@ -193,30 +235,52 @@ class StreamManager:
             logger.error(f"Stream not found for write: {stream_id}")
             return False
 
-        with stream.lock:
-            if stream.status != StreamStatus.UPLOADING:
-                logger.error(f"Stream {stream_id} is not in uploading state")
+        if stream.status != StreamStatus.UPLOADING:
+            logger.error(f"Stream {stream_id} is not in uploading state")
+            return False
+
+        try:
+            # Write data to memory-mapped file
+            offset = stream.current_offset
+            if through_fd:
+                written = stream.mmap_file.pwrite(offset, data)
+            else:
+                # Contexts given their cache after construction have no bound write
+                write = stream._write or stream.mmap_file.write
+                written = write(offset, data)
+
+            if written > 0:
+                stream.current_offset = offset + written
+                stream.total_size += written
+                stream.update_access_time()
+
+                logger.debug(
+                    "Wrote {} bytes to stream {} at offset {}",
+                    written, stream_id, offset)
+                return True
+            else:
+                logger.error(f"Failed to write data to stream {stream_id}")
                 return False
 
-            try:
-                # Write data to memory-mapped file
-                written = stream.mmap_file.write(stream.current_offset, data)
+        except Exception as e:
+            logger.error(f"Error writing to stream {stream_id}: {e}")
+            return False
 
-                if written > 0:
-                    stream.current_offset += written
-                    stream.total_size += written
-                    stream.update_access_time()
+    async def write_chunk_async(self, stream_id: str, data: Buffer) -> bool:
+        """
+        Write a chunk of data to a stream from a worker thread.
 
-                    logger.debug(
-                        f"Wrote {written} bytes to stream {stream_id} at offset {stream.current_offset - written}")
-                    return True
-                else:
-                    logger.error(f"Failed to write data to stream {stream_id}")
-                    return False
+        The copy runs through pwrite, which releases the GIL, so page
+        faults and disk allocation do not stall the event loop.
 
-            except Exception as e:
-                logger.error(f"Error writing to stream {stream_id}: {e}")
-                return False
+        Args:
+            stream_id: Unique identifier for the stream
+            data: Data to write
+
+        Returns:
+            True if successful
+        """
+        return await asyncio.to_thread(self.write_chunk, stream_id, data, True)
 
     def read_chunk(self, stream_id: str, offset: int, length: int) -> bytes:
         """
@@ -235,19 +299,18 @@ class StreamManager:
             logger.error(f"Stream not found for read: {stream_id}")
             return b''
 
-        with stream.lock:
-            try:
-                # Read data from memory-mapped file
-                data = stream.mmap_file.read(offset, length)
-                stream.update_access_time()
+        try:
+            # Read data from memory-mapped file
+            data = stream.mmap_file.read(offset, length)
+            stream.update_access_time()
 
-                logger.debug(
-                    f"Read {len(data)} bytes from stream {stream_id} at offset {offset}")
-                return data
+            logger.debug(
+                "Read {} bytes from stream {} at offset {}", len(data), stream_id, offset)
+            return data
 
-            except Exception as e:
-                logger.error(f"Error reading from stream {stream_id}: {e}")
-                return b''
+        except Exception as e:
+            logger.error(f"Error reading from stream {stream_id}: {e}")
+            return b''
 
     def finalize_stream(self, stream_id: str) -> bool:
         """
@@ -264,30 +327,72 @@ class StreamManager:
             logger.error(f"Stream not found for finalization: {stream_id}")
             return False
 
-        with stream.lock:
-            if stream.status != StreamStatus.UPLOADING:
-                logger.warning(
-                    f"Stream {stream_id} is not in uploading state for finalization")
-                return False
+        if stream.status != StreamStatus.UPLOADING:
+            logger.warning(
+                f"Stream {stream_id} is not in uploading state for finalization")
+            return False
 
-            try:
-                # Finalize memory-mapped file
-                if stream.mmap_file.finalize(stream.total_size):
-                    stream.status = StreamStatus.READY
-                    stream.update_access_time()
-
-                    logger.info(
-                        f"Finalized stream: {stream_id} with {stream.total_size} bytes")
-                    return True
-                else:
-                    logger.error(
-                        f"Failed to finalize memory-mapped file for stream {stream_id}")
-                    return False
+        try:
+            # Finalize memory-mapped file; reads are served from the page
+            # cache, so the disk write-back can finish in the background
+            if stream.mmap_file.finalize(stream.total_size, sync=False):
+                self._sync_executor.submit(stream.mmap_file.sync)
+                stream.status = StreamStatus.READY
+                stream.update_access_time()
 
-            except Exception as e:
-                logger.error(f"Error finalizing stream {stream_id}: {e}")
+                logger.info(
+                    f"Finalized stream: {stream_id} with {stream.total_size} bytes")
+                return True
+            else:
+                logger.error(
+                    f"Failed to finalize memory-mapped file for stream {stream_id}")
                 return False
 
+        except Exception as e:
+            logger.error(f"Error finalizing stream {stream_id}: {e}")
+            return False
+
+    async def finalize_stream_async(self, stream_id: str) -> bool:
+        """
+        Finalize a stream from a worker thread, keeping the file trim and
+        remap off the event loop.
+
+        Args:
+            stream_id: Unique identifier for the stream
+
+        Returns:
+            True if successful
+        """
+        return await asyncio.to_thread(self.finalize_stream, stream_id)
+
+    def checkpoint_streams(self, dirty_threshold: int) -> int:
+        """
+        Queue a background disk sync for every uploading stream with at
+        least dirty_threshold unsynced bytes, spreading write-back over the
+        upload instead of leaving it all for the end. Finalized streams are
+        synced by finalize_stream.
+
+        Writers only ever advance total_size and this method alone writes
+        synced_size, so a write running in a worker thread is never lost.
+
+        Args:
+            dirty_threshold: Unsynced bytes that trigger a sync
+
+        Returns:
+            Number of streams queued
+        """
+        queued = 0
+        for shard in self.shards:
+            for context in shard.values():
+                if context.status != StreamStatus.UPLOADING or not context.mmap_file:
+                    continue
+                size = context.total_size
+                if size - context.synced_size >= dirty_threshold:
+                    context.synced_size = size
+                    self._sync_executor.submit(context.mmap_file.sync)
+                    queued += 1
+        return queued
+
     def cleanup_old_streams(self, max_age_hours: int = 24) -> None:
         """
         Clean up old streams (older than max_age_hours).
@@ -295,21 +400,57 @@ class StreamManager:
         Args:
             max_age_hours: Maximum age in hours (default 24)
         """
-        with self.mutex:
-            now = datetime.now()
-            cutoff = timedelta(hours=max_age_hours)
+        cutoff = time.monotonic() - max_age_hours * 3600
+
+        # Shard by shard, so only one shard's lock is held at a time; the
+        # scan reads the published shard without it
+        for index, shard in enumerate(self.shards):
+            expired = [stream_id for stream_id, context in shard.items()
+                       if context.last_accessed_at < cutoff]
+            if expired:
+                self._cleanup_shard(index, expired, cutoff)
 
-            to_remove = []
-            for stream_id, context in self.streams.items():
-                age = now - context.last_accessed_at
-                if age > cutoff:
-                    to_remove.append(stream_id)
+    def _cleanup_shard(self, index: int, stream_ids: List[str], cutoff: float) -> None:
+        """
+        Delete expired streams of one shard.
 
-            for stream_id in to_remove:
+        Args:
+            index: Shard holding the streams
+            stream_ids: Streams found expired by the unlocked scan
+            cutoff: time.monotonic() before which a stream counts as expired
+        """
+        with self.shard_locks[index]:
+            for stream_id in stream_ids:
+                context = self.shards[index].get(stream_id)
+                if context is None:
+                    continue
+                if context.last_accessed_at >= cutoff:
+                    continue  # Touched since the scan
                 logger.info(f"Cleaning up old stream: {stream_id}")
-                self.delete_stream(stream_id)
+                self._delete_stream_locked(index, stream_id)
+
+    def close(self) -> None:
+        """
+        Wait for queued disk syncs to finish and stop the sync thread.
+        Streams queued for a sync after this are not synced.
+        """
+        self._sync_executor.shutdown(wait=True)
+        logger.info("StreamManager closed")
+
+    @staticmethod
+    def _shard(stream_id: str) -> int:
+        """
+        Get the shard index for a stream.
+
+        Args:
+            stream_id: Unique identifier for the stream
+
+        Returns:
+            Index into shards and shard_locks
+        """
+        return hash(stream_id) & (SHARD_COUNT - 1)
 
-    def _get_cache_path(self, stream_id: str) -> str:
+    def _get_cache_path(self, stream_id: str) -> Path:
         """
         Get cache file path for a stream.
 
@@ -319,4 +460,4 @@ class StreamManager:
         Returns:
             Cache file path
         """
-        return os.path.join(self.cache_directory, f"{stream_id}.cache")
+        return self.cache_dir / f"{stream_id}.cache"
@@ -5,7 +5,9 @@ Matches C++ WebSocketServer and Java AudioWebSocketServer functionality.
 """
 
 import asyncio
-from typing import Set
+import contextlib
+import weakref
+from typing import Optional
 import websockets
 from websockets.asyncio.server import serve, ServerConnection
 from loguru import logger
@@ -13,6 +15,10 @@ from loguru import logger
 from ..memory.stream_manager import StreamManager
 from ..memory.memory_pool_manager import MemoryPoolManager
 from ..handler.websocket_message_handler import WebSocketMessageHandler
+from .event_loop import install_event_loop
+
+# Pending connections the kernel queues while the loop is busy accepting
+LISTEN_BACKLOG = 4096
 
 
 class AudioWebSocketServer:
@@ -21,7 +27,9 @@ class AudioWebSocketServer:
     Manages client connections and routes messages to handler.
     """
 
-    def __init__(self, host: str = "0.0.0.0", port: int = 8080, path: str = "/audio"):
+    def __init__(self, host: str = "0.0.0.0", port: int = 8080, path: str = "/audio",
+                 checkpoint_interval_ms: int = 1000,
+                 checkpoint_bytes: int = 64 * 1024 * 1024):
         """
         Initialize WebSocket server.
 
@@ -29,11 +37,18 @@ class AudioWebSocketServer:
             host: Host address to bind to
             port: Port number to listen on
             path: WebSocket endpoint path
+            checkpoint_interval_ms: How often streams are checked for unsynced
+                data, in milliseconds (0 disables periodic syncing)
+            checkpoint_bytes: Unsynced bytes that make a stream due for a sync
         """
         self.host = host
         self.port = port
         self.path = path
-        self.clients: Set[ServerConnection] = set()
+        self.checkpoint_interval_ms = checkpoint_interval_ms
+        self.checkpoint_bytes = checkpoint_bytes
+        self._checkpoint_task: Optional[asyncio.Task] = None
+        # Weak references only back up the discard in handle_client
+        self.clients: "weakref.WeakSet[ServerConnection]" = weakref.WeakSet()
         self.stream_manager = StreamManager.get_instance()
         self.memory_pool = MemoryPoolManager.get_instance()
         self.message_handler = WebSocketMessageHandler(self.stream_manager)
@@ -50,17 +65,36 @@ class AudioWebSocketServer:
             max_size=100 * 1024 * 1024,  # 100MB max message size
             ping_interval=20,
             ping_timeout=20,
+            # Audio payloads are already compressed; deflate only costs CPU
+            compression=None,
+            backlog=LISTEN_BACKLOG,
         )
+        if self.checkpoint_interval_ms > 0:
+            self._checkpoint_task = asyncio.create_task(self._checkpoint_loop())
         logger.info(
             f"WebSocket server started on ws://{self.host}:{self.port}{self.path}"
         )
 
     async def stop(self):
         """Stop the WebSocket server"""
+        if self._checkpoint_task:
+            self._checkpoint_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._checkpoint_task
+            self._checkpoint_task = None
         if self.server:
             self.server.close()
             await self.server.wait_closed()
             logger.info("WebSocket server stopped")
+        # Closed connections may have queued final syncs; let them land
+        await asyncio.to_thread(self.stream_manager.close)
+
+    async def _checkpoint_loop(self):
+        """Periodically queue disk syncs for streams with enough unsynced data"""
+        interval = self.checkpoint_interval_ms / 1000.0
+        while True:
+            await asyncio.sleep(interval)
+            self.stream_manager.checkpoint_streams(self.checkpoint_bytes)
 
     async def handle_client(self, websocket: ServerConnection):
         """
@@ -73,6 +107,7 @@ class AudioWebSocketServer:
         self.clients.add(websocket)
         client_addr = f"{websocket.remote_address[0]}:{websocket.remote_address[1]}"
         logger.info(f"Client connected: {client_addr}")
+        self.message_handler.open_connection(websocket)
 
         try:
             async for message in websocket:
@@ -80,6 +115,8 @@ class AudioWebSocketServer:
         except Exception as e:
             logger.error(f"Error handling client {client_addr}: {e}")
         finally:
+            # Send any queued replies before unregistering
+            await self.message_handler.close_connection(websocket)
             # Unregister client
             self.clients.discard(websocket)
             logger.info(f"Client disconnected: {client_addr}")
@@ -99,4 +136,5 @@ async def main():
 
 
 if __name__ == "__main__":
+    install_event_loop()
     asyncio.run(main())
@@ -0,0 +1,17 @@
+"""Shared fixtures for the audio server tests."""
+
+import pytest
+
+from audio_server.memory.stream_manager import StreamManager
+
+
+@pytest.fixture
+def stream_manager(tmp_path):
+    """A fresh StreamManager singleton caching under a temporary directory."""
+    StreamManager._instance = None
+    manager = StreamManager.get_instance(str(tmp_path / "cache"))
+    yield manager
+    for stream_id in manager.list_active_streams():
+        manager.delete_stream(stream_id)
+    manager.close()
+    StreamManager._instance = None
@@ -0,0 +1,54 @@
+"""End-to-end tests of AudioWebSocketServer over a real socket."""
+
+import json
+import os
+
+import pytest
+from websockets.asyncio.client import connect
+
+from audio_server.network.audio_websocket_server import AudioWebSocketServer
+
+
+@pytest.fixture
+async def server_uri(stream_manager):
+    server = AudioWebSocketServer(host="127.0.0.1", port=0)
+    await server.start()
+    port = server.server.sockets[0].getsockname()[1]
+    yield f"ws://127.0.0.1:{port}/audio"
+    await server.stop()
+
+
+async def test_upload_then_download(server_uri):
+    data = os.urandom(3 * 1024 * 1024 + 123)
+    async with connect(server_uri, compression=None, max_size=None) as ws:
+        await ws.send(json.dumps({"type": "START", "streamId": "e2e"}))
+        assert json.loads(await ws.recv())["type"] == "STARTED"
+        for offset in range(0, len(data), 8192):
+            await ws.send(data[offset:offset + 8192])
+        await ws.send(json.dumps({"type": "STOP", "streamId": "e2e"}))
+        assert json.loads(await ws.recv())["type"] == "STOPPED"
+
+        received = bytearray()
+        while len(received) < len(data):
+            await ws.send(json.dumps({"type": "GET", "streamId": "e2e",
+                                      "offset": len(received), "length": 1 << 20}))
+            received += await ws.recv()
+    assert bytes(received) == data
+
+
+async def test_get_of_unknown_stream_returns_error(server_uri):
+    async with connect(server_uri) as ws:
+        await ws.send(json.dumps({"type": "GET", "streamId": "missing", "offset": 0, "length": 10}))
+        reply = json.loads(await ws.recv())
+    assert reply["type"] == "ERROR"
+
+
+async def test_stop_waits_for_checkpoints_and_syncs(stream_manager):
+    server = AudioWebSocketServer(host="127.0.0.1", port=0, checkpoint_interval_ms=10)
+    await server.start()
+    checkpoint_task = server._checkpoint_task
+    await server.stop()
+
+    assert checkpoint_task.done()
+    with pytest.raises(RuntimeError):
+        stream_manager._sync_executor.submit(lambda: None)
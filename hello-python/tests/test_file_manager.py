@@ -0,0 +1,94 @@
+"""Tests for the client's file_manager module."""
+
+import hashlib
+import os
+
+import pytest
+
+from audio_client.core import file_manager
+
+
+async def test_read_chunk_reads_range(tmp_path):
+    path = tmp_path / "input.bin"
+    data = os.urandom(10_000)
+    path.write_bytes(data)
+    assert await file_manager.read_chunk(str(path), 100, 500) == data[100:600]
+    assert await file_manager.read_chunk(str(path), 9_900, 500) == data[9_900:]
+
+
+def test_mapped_file_reads_views(tmp_path):
+    path = tmp_path / "input.bin"
+    data = os.urandom(10_000)
+    path.write_bytes(data)
+    with file_manager.MappedFile(str(path)) as mapped_file:
+        assert mapped_file.size == len(data)
+        assert bytes(mapped_file.read(0, 64)) == data[:64]
+
+
+def test_mapped_file_handles_empty_file(tmp_path):
+    path = tmp_path / "empty.bin"
+    path.write_bytes(b"")
+    with file_manager.MappedFile(str(path)) as mapped_file:
+        assert mapped_file.size == 0
+        assert bytes(mapped_file.read(0, 64)) == b""
+
+
+async def test_calculate_checksum_matches_hashlib(tmp_path):
+    path = tmp_path / "input.bin"
+    data = os.urandom(3 * 1024 * 1024 + 7)
+    path.write_bytes(data)
+    assert await file_manager.calculate_checksum(str(path)) == hashlib.sha256(data).hexdigest()
+
+
+async def test_file_writer_round_trip(tmp_path):
+    path = tmp_path / "out.bin"
+    data = os.urandom(100_000)
+    async with file_manager.FileWriter(str(path)) as writer:
+        for offset in range(0, len(data), 4096):
+            assert await writer.write(data[offset:offset + 4096])
+    assert path.read_bytes() == data
+
+
+async def test_mapped_file_writer_trims_unwritten_tail(tmp_path):
+    path = tmp_path / "out.bin"
+    writer = file_manager.FileWriter(str(path))
+    assert await writer.open(expected_size=10_000)
+    assert await writer.write_at(0, b"y" * 4000)
+    await writer.close()
+    assert path.read_bytes() == b"y" * 4000
+
+
+async def test_close_error_does_not_hide_body_error(tmp_path):
+    def fail():
+        raise OSError("close failed")
+
+    with pytest.raises(ValueError, match="body failed"):
+        async with file_manager.FileWriter(str(tmp_path / "out.bin")) as writer:
+            writer._flush_iov = fail
+            raise ValueError("body failed")
+    assert writer.fd is None
+
+
+async def test_close_error_is_raised_without_body_error(tmp_path):
+    def fail():
+        raise OSError("close failed")
+
+    writer = file_manager.FileWriter(str(tmp_path / "out.bin"))
+    assert await writer.open()
+    writer._flush_iov = fail
+    with pytest.raises(OSError, match="close failed"):
+        await writer.close()
+    assert writer.fd is None
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="needs /proc to count descriptors")
+async def test_failed_mapping_closes_descriptor(tmp_path, monkeypatch):
+    def fail(*args, **kwargs):
+        raise OSError("mmap failed")
+
+    monkeypatch.setattr(file_manager.mmap, "mmap", fail)
+    writer = file_manager.FileWriter(str(tmp_path / "out.bin"))
+    before = len(os.listdir("/proc/self/fd"))
+    assert not await writer.open(expected_size=10_000)
+    assert writer.fd is None and not writer.is_open
+    assert len(os.listdir("/proc/self/fd")) == before
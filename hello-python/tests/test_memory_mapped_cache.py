@@ -0,0 +1,73 @@
+"""Tests for MemoryMappedCache."""
+
+import os
+
+from audio_server.memory.memory_mapped_cache import MemoryMappedCache
+
+
+def test_write_then_read(tmp_path):
+    cache = MemoryMappedCache(tmp_path / "a.cache")
+    assert cache.write(0, b"hello ") == 6
+    assert cache.write(6, memoryview(b"world")) == 5
+    assert cache.read(0, 64) == b"hello world"
+    assert cache.read(6, 3) == b"wor"
+    assert cache.read(11, 10) == b""
+    cache.close()
+
+
+def test_read_result_does_not_pin_mapping_across_resize(tmp_path):
+    cache = MemoryMappedCache(tmp_path / "a.cache")
+    first = os.urandom(4096)
+    cache.write(0, first)
+    held = cache.read(0, len(first))
+
+    # Growing past the capacity remaps the file while the read is still held
+    tail = os.urandom(64 * 1024)
+    offset = cache.capacity
+    assert cache.write(offset, tail) == len(tail)
+    assert cache.read(0, len(first)) == first
+    assert cache.read(offset, len(tail)) == tail
+    assert held == first
+    cache.close()
+
+
+def test_read_result_does_not_pin_mapping_across_finalize_and_close(tmp_path):
+    path = tmp_path / "a.cache"
+    cache = MemoryMappedCache(path)
+    data = os.urandom(10_000)
+    cache.write(0, data)
+    held = cache.read(100, 200)
+
+    assert cache.finalize(len(data))
+    assert os.path.getsize(path) == len(data)
+    cache.close()
+    assert not cache.get_is_open()
+    assert held == data[100:300]
+
+
+def test_finalize_trims_preallocated_tail(tmp_path):
+    path = tmp_path / "a.cache"
+    cache = MemoryMappedCache(path, initial_size=1 << 20)
+    cache.write(0, b"x" * 1000)
+    assert cache.finalize(1000)
+    cache.close()
+    assert os.path.getsize(path) == 1000
+
+
+def test_pwrite_is_visible_through_read(tmp_path):
+    cache = MemoryMappedCache(tmp_path / "a.cache")
+    data = os.urandom(300_000)
+    assert cache.pwrite(0, data) == len(data)
+    assert cache.read(0, len(data)) == data
+    cache.close()
+
+
+def test_reopen_after_close_reads_written_data(tmp_path):
+    path = tmp_path / "a.cache"
+    cache = MemoryMappedCache(path)
+    cache.write(0, b"abc" * 1000)
+    cache.close()
+    # read() reopens a closed cache, which then sees the trimmed length
+    assert cache.read(0, 3000) == b"abc" * 1000
+    assert cache.get_size() == 3000
+    cache.close()
@@ -0,0 +1,79 @@
+"""Tests for StreamManager."""
+
+import threading
+import time
+
+from audio_server.memory.memory_mapped_cache import MemoryMappedCache
+from audio_server.memory.stream_context import StreamContext, StreamStatus
+
+
+def test_cleanup_removes_only_idle_streams(stream_manager):
+    assert stream_manager.create_stream("old")
+    assert stream_manager.create_stream("fresh")
+    stream_manager.write_chunk("old", b"x" * 100)
+    # get_stream() refreshes the access time, so backdate after the lookup
+    old = stream_manager.get_stream("old")
+    old.last_accessed_at = time.monotonic() - 2 * 3600
+
+    stream_manager.cleanup_old_streams(max_age_hours=1)
+
+    assert stream_manager.list_active_streams() == ["fresh"]
+    assert not old.cache_path.exists()
+    assert stream_manager.get_stream("fresh").status == StreamStatus.UPLOADING
+
+
+def test_checkpoint_queues_sync_per_threshold(stream_manager):
+    assert stream_manager.create_stream("s")
+    stream_manager.write_chunk("s", b"x" * 5000)
+    assert stream_manager.checkpoint_streams(4096) == 1
+    assert stream_manager.checkpoint_streams(4096) == 0
+    stream_manager.write_chunk("s", b"x" * 3000)
+    assert stream_manager.checkpoint_streams(4096) == 0
+    stream_manager.write_chunk("s", b"x" * 2000)
+    assert stream_manager.checkpoint_streams(4096) == 1
+
+
+def test_checkpoint_does_not_lose_writes_from_worker_threads(stream_manager):
+    assert stream_manager.create_stream("s")
+    chunk = b"x" * 1000
+    done = threading.Event()
+
+    def writer():
+        for _ in range(2000):
+            stream_manager.write_chunk("s", chunk, through_fd=True)
+        done.set()
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    while not done.is_set():
+        stream_manager.checkpoint_streams(10_000)
+    thread.join()
+
+    stream = stream_manager.get_stream("s")
+    assert stream.total_size == 2000 * len(chunk)
+    # Whatever the interleaving, the unsynced tail is exactly what remains
+    unsynced = stream.total_size - stream.synced_size
+    assert stream_manager.checkpoint_streams(unsynced or 1) == (1 if unsynced else 0)
+    assert stream.synced_size == stream.total_size
+
+
+def test_finalized_streams_are_not_checkpointed(stream_manager):
+    assert stream_manager.create_stream("s")
+    stream_manager.write_chunk("s", b"x" * 5000)
+    assert stream_manager.finalize_stream("s")
+    assert stream_manager.checkpoint_streams(1) == 0
+
+
+def test_write_to_context_built_outside_create_stream(stream_manager, tmp_path):
+    cache = MemoryMappedCache(tmp_path / "s.cache")
+    assert StreamContext("bound", mmap_file=cache)._write == cache.write
+
+    # A context handed its cache after construction falls back to the cache
+    context = StreamContext("late", cache_path=tmp_path / "s.cache")
+    context.mmap_file = cache
+    index = stream_manager._shard("late")
+    stream_manager.shards[index] = {**stream_manager.shards[index], "late": context}
+
+    assert stream_manager.write_chunk("late", b"audio")
+    assert stream_manager.read_chunk("late", 0, 5) == b"audio"
+    cache.close()
@@ -0,0 +1,61 @@
+"""Tests for UploadManager error reporting."""
+
+import hashlib
+import os
+
+from audio_client.core.upload_manager import UploadManager
+from audio_client.util.error_handler import ErrorHandler, ErrorType
+
+
+async def test_missing_file_is_reported(tmp_path):
+    error_handler = ErrorHandler()
+    manager = UploadManager(None, error_handler=error_handler)
+    assert await manager.upload_file(str(tmp_path / "missing.mp3")) == ""
+    assert error_handler.get_error_count(ErrorType.FILE_IO_ERROR) == 1
+
+
+async def test_unreadable_file_is_reported(tmp_path, monkeypatch):
+    path = tmp_path / "locked.mp3"
+    path.write_bytes(b"audio")
+
+    def deny(*args, **kwargs):
+        raise PermissionError(13, "Permission denied", str(path))
+
+    monkeypatch.setattr(os, "stat", deny)
+    error_handler = ErrorHandler()
+    manager = UploadManager(None, error_handler=error_handler)
+    assert await manager.upload_file(str(path)) == ""
+    assert error_handler.get_error_count(ErrorType.FILE_IO_ERROR) == 1
+
+
+class FakeClient:
+    """Sender that completes immediately and keeps a copy of each frame"""
+
+    def __init__(self):
+        self.frames = []
+
+    async def send_binary(self, data):
+        self.frames.append(bytes(data))
+
+
+async def test_send_file_chunks_unmaps_cleanly(tmp_path):
+    data = os.urandom(3 * 1024 * 1024 + 77)
+    path = tmp_path / "audio.mp3"
+    path.write_bytes(data)
+
+    # The loop resumes fast enough here to race the executor's cleanup, so
+    # repeat to catch a view that outlives the hash
+    for _ in range(50):
+        client = FakeClient()
+        manager = UploadManager(client)
+        manager.chunk_size = 64 * 1024
+        assert await manager._send_file_chunks(str(path), len(data))
+        assert b"".join(client.frames) == data
+        assert manager._hasher.hexdigest() == hashlib.sha256(data).hexdigest()
+
+
+async def test_send_file_chunks_stops_on_short_file(tmp_path):
+    path = tmp_path / "short.mp3"
+    path.write_bytes(b"audio")
+    manager = UploadManager(FakeClient())
+    assert not await manager._send_file_chunks(str(path), 10)
@@ -0,0 +1,49 @@
+"""Tests for the client's file verification."""
+
+import hashlib
+
+import pytest
+
+from audio_client.util.verification_module import verify
+
+
+@pytest.fixture
+def files(tmp_path):
+    original = tmp_path / "original.bin"
+    downloaded = tmp_path / "downloaded.bin"
+    original.write_bytes(b"audio" * 1000)
+    downloaded.write_bytes(b"audio" * 1000)
+    return str(original), str(downloaded)
+
+
+async def test_matching_precomputed_checksums_pass(files):
+    digest = hashlib.sha256(b"audio" * 1000).hexdigest()
+    result = await verify(*files, ("sha256", digest), ("sha256", digest))
+    assert result["passed"]
+    assert result["original_checksum"] == digest
+
+
+async def test_checksum_of_another_algorithm_is_recomputed(files):
+    # A digest under a different algorithm must not be compared as-is
+    sha256 = hashlib.sha256(b"audio" * 1000).hexdigest()
+    md5 = hashlib.md5(b"audio" * 1000).hexdigest()
+    result = await verify(*files, ("md5", md5), ("sha256", sha256))
+    assert result["passed"]
+    assert result["original_checksum"] == sha256
+
+
+async def test_content_mismatch_fails(files):
+    original, downloaded = files
+    with open(downloaded, "r+b") as f:
+        f.write(b"x")
+    result = await verify(original, downloaded)
+    assert not result["passed"]
+
+
+async def test_size_mismatch_skips_checksums(files):
+    original, downloaded = files
+    with open(downloaded, "ab") as f:
+        f.write(b"x")
+    result = await verify(original, downloaded)
+    assert not result["passed"]
+    assert result["original_checksum"] is None
@@ -0,0 +1,36 @@
+"""Tests for WebSocketClient socket tuning."""
+
+import socket
+
+import pytest
+
+from audio_client.core.websocket_client import WebSocketClient
+from audio_server.network.audio_websocket_server import AudioWebSocketServer
+
+
+@pytest.fixture
+async def server_uri(stream_manager):
+    server = AudioWebSocketServer(host="127.0.0.1", port=0)
+    await server.start()
+    port = server.server.sockets[0].getsockname()[1]
+    yield f"ws://127.0.0.1:{port}/audio"
+    await server.stop()
+
+
+def receive_buffer(client):
+    sock = client.ws.transport.get_extra_info('socket')
+    return sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+
+
+async def test_socket_buffer_size_is_applied(server_uri):
+    default = WebSocketClient(server_uri)
+    await default.connect()
+    tuned = WebSocketClient(server_uri, socket_buffer_size=320 * 1024)
+    await tuned.connect()
+    try:
+        # Linux reports double the requested size to account for bookkeeping
+        assert receive_buffer(tuned) in (320 * 1024, 640 * 1024)
+        assert receive_buffer(default) != receive_buffer(tuned)
+    finally:
+        await tuned.close()
+        await default.close()
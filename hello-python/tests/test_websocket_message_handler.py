@@ -0,0 +1,135 @@
+"""Tests for WebSocketMessageHandler against an in-memory connection."""
+
+import asyncio
+import json
+import os
+
+import pytest
+
+from audio_server.handler.websocket_message_handler import (
+    OFFLOAD_SIZE,
+    WebSocketMessageHandler,
+)
+
+
+class FakeConnection:
+    """Connection stand-in whose sends can be held back with a gate."""
+
+    def __init__(self):
+        self.sent = []
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    async def send(self, payload):
+        await self.gate.wait()
+        self.sent.append(payload)
+
+
+@pytest.fixture
+async def connection(stream_manager):
+    handler = WebSocketMessageHandler(stream_manager)
+    websocket = FakeConnection()
+    handler.open_connection(websocket)
+    yield handler, websocket
+    websocket.gate.set()
+    await handler.close_connection(websocket)
+
+
+async def control(handler, websocket, **message):
+    await handler.handle_message(websocket, json.dumps(message))
+
+
+def replies(websocket, kind):
+    return [p for p in websocket.sent if isinstance(p, kind)]
+
+
+async def test_upload_get_stop_round_trip(connection, stream_manager):
+    handler, websocket = connection
+    await control(handler, websocket, type="START", streamId="s1")
+
+    # Small frames are coalesced, mid-sized ones written inline and large
+    # ones offloaded to a worker thread; the stream must keep their order
+    frames = [os.urandom(1000) for _ in range(20)]
+    frames += [os.urandom(100_000), os.urandom(10), os.urandom(OFFLOAD_SIZE + 1)]
+    for frame in frames:
+        await handler.handle_message(websocket, frame)
+    data = b"".join(frames)
+
+    # GET before STOP sees the coalesced frames too
+    await control(handler, websocket, type="GET", streamId="s1", offset=0, length=20_000)
+    await control(handler, websocket, type="STOP", streamId="s1")
+    await control(handler, websocket, type="GET", streamId="s1", offset=20_000, length=len(data))
+    await handler.close_connection(websocket)
+
+    texts = [json.loads(p) for p in replies(websocket, str)]
+    assert [t["type"] for t in texts] == ["STARTED", "STOPPED"]
+    chunks = replies(websocket, bytes)
+    assert chunks == [data[:20_000], data[20_000:]]
+    assert stream_manager.get_stream("s1").total_size == len(data)
+
+
+async def test_get_reply_does_not_block_stream_growth(connection, stream_manager):
+    handler, websocket = connection
+    await control(handler, websocket, type="START", streamId="s1")
+    first = os.urandom(100_000)
+    await handler.handle_message(websocket, first)
+
+    # Hold the GET reply in the outbox while the stream is remapped
+    websocket.gate.clear()
+    await control(handler, websocket, type="GET", streamId="s1", offset=0, length=len(first))
+    capacity = stream_manager.get_stream("s1").mmap_file.capacity
+    tail = os.urandom(capacity)
+    await handler.handle_message(websocket, tail)
+    await control(handler, websocket, type="STOP", streamId="s1")
+
+    websocket.gate.set()
+    await control(handler, websocket, type="GET", streamId="s1", offset=len(first), length=len(tail))
+    await handler.close_connection(websocket)
+
+    assert replies(websocket, bytes) == [first, tail]
+    assert [json.loads(p)["type"] for p in replies(websocket, str)] == ["STARTED", "STOPPED"]
+
+
+async def test_delete_while_get_reply_is_pending(connection, stream_manager):
+    handler, websocket = connection
+    await control(handler, websocket, type="START", streamId="s1")
+    data = os.urandom(200_000)
+    await handler.handle_message(websocket, data)
+    await control(handler, websocket, type="STOP", streamId="s1")
+
+    websocket.gate.clear()
+    await control(handler, websocket, type="GET", streamId="s1", offset=0, length=len(data))
+    path = stream_manager.get_stream("s1").cache_path
+    assert stream_manager.delete_stream("s1")
+    assert not path.exists()
+
+    websocket.gate.set()
+    await handler.close_connection(websocket)
+    assert replies(websocket, bytes) == [data]
+
+
+async def test_binary_without_stream_is_rejected(connection):
+    handler, websocket = connection
+    await handler.handle_message(websocket, b"orphan")
+    await handler.close_connection(websocket)
+    assert json.loads(websocket.sent[0])["type"] == "ERROR"
+
+
+async def test_invalid_json_is_rejected(connection):
+    handler, websocket = connection
+    await handler.handle_message(websocket, "{not json")
+    await handler.close_connection(websocket)
+    error = json.loads(websocket.sent[0])
+    assert error == {"type": "ERROR", "message": "Invalid JSON format"}
+
+
+async def test_start_preallocates_announced_size(connection, stream_manager):
+    handler, websocket = connection
+    await control(handler, websocket, type="START", streamId="s1", totalSize=3 << 20)
+    assert stream_manager.get_stream("s1").mmap_file.initial_size == 3 << 20
+
+    await control(handler, websocket, type="START", streamId="s2", totalSize=-1)
+    assert stream_manager.get_stream("s2") is None
+    await handler.close_connection(websocket)
+    texts = [json.loads(p) for p in replies(websocket, str)]
+    assert [t["type"] for t in texts] == ["STARTED", "ERROR"]